@@ -1,9 +1,17 @@
 from pymazda.client import Client
+from pymazda.credential_store import CredentialStore, FileCredentialStore
+from pymazda.pool import ClientPool
+from pymazda.rate_limiter import RateLimiter
+from pymazda.response_cache import ResponseCache
+from pymazda.retry import RetryPolicy, RetryRule
 from pymazda.exceptions import (
     MazdaException,
     MazdaAPIEncryptionException,
     MazdaAuthenticationException,
     MazdaAccountLockedException,
     MazdaTokenExpiredException,
-    MazdaLoginFailedException
+    MazdaLoginFailedException,
+    MazdaRequestTimeoutException,
+    MazdaCommandSupersededException,
+    MazdaRateLimitedException
 )
\ No newline at end of file
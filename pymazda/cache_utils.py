@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded mapping which evicts the least recently used entry when full"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._entries.pop(key, default)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire a fixed number of seconds after they were stored"""
+
+    def __init__(self, max_size, ttl):
+        self.ttl = ttl
+        self._entries = LRUCache(max_size)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key)
+            return default
+
+        return value
+
+    def set(self, key, value):
+        self._entries.set(key, (value, time.monotonic() + self.ttl))
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
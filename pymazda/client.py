@@ -1,30 +1,81 @@
+import asyncio
 import datetime
 import json
+import time
 
+from pymazda.cache_utils import TTLCache
+from pymazda.confirmation import ConfirmationTracker
 from pymazda.controller import Controller
-from pymazda.exceptions import MazdaConfigException
+from pymazda.exceptions import MazdaConfigException, MazdaException, MazdaRequestTimeoutException
+from pymazda.watch import CallBudget, diff_vehicle_status, is_vehicle_active
+
+NICKNAME_CACHE_SIZE = 256
+
+def get_vehicle_status_timestamp(vehicle_status_response):
+    return vehicle_status_response.get("alertInfos", [{}])[0].get("OccurrenceDate")
+
+def get_ev_vehicle_status_timestamp(ev_vehicle_status_response):
+    return ev_vehicle_status_response.get("resultData", [{}])[0].get("OccurrenceDate")
+
+def get_lock_state(vehicle_status):
+    door_lock_status = vehicle_status["doorLocks"]
+    return not (
+        door_lock_status["driverDoorUnlocked"]
+        or door_lock_status["passengerDoorUnlocked"]
+        or door_lock_status["rearLeftDoorUnlocked"]
+        or door_lock_status["rearRightDoorUnlocked"]
+    )
+
+def get_hvac_mode(ev_vehicle_status):
+    return ev_vehicle_status["hvacInfo"]["hvacOn"]
+
+# How to check each assumed value against the API, as the status source and a function reading the value from it
+CONFIRMATION_SOURCES = {
+    "lock_state": ("status", get_lock_state),
+    "hvac_mode": ("evStatus", get_hvac_mode)
+}
 
 class Client:
-    def __init__(self, email, password, region, websession=None, use_cached_vehicle_list=False):
+    def __init__(self, email, password, region, websession=None, use_cached_vehicle_list=False, retry_policy=None, vehicle_list_cache_ttl=3600, nickname_cache_ttl=3600, max_concurrent_requests=4, close_websession=True, credential_store=None, response_cache=None, watch_max_calls=None, watch_call_period=3600, rate_limiter=None):
         if email is None or len(email) == 0:
             raise MazdaConfigException("Invalid or missing email address")
         if password is None or len(password) == 0:
             raise MazdaConfigException("Invalid or missing password")
 
-        self.controller = Controller(email, password, region, websession)
+        self.controller = Controller(email, password, region, websession, retry_policy=retry_policy, close_websession=close_websession, credential_store=credential_store, rate_limiter=rate_limiter)
 
         self._cached_state = {}
         self._use_cached_vehicle_list = use_cached_vehicle_list
+        self._vehicle_list_cache_ttl = vehicle_list_cache_ttl
         self._cached_vehicle_list = None
+        self._cached_vehicle_list_timestamp = None
+        # Whether each vehicle is electric never changes, so it is remembered even when the vehicle list is not cached
+        self._is_electric_by_vehicle_id = {}
+        self._nickname_cache = TTLCache(NICKNAME_CACHE_SIZE, nickname_cache_ttl)
+        self._max_concurrent_requests = max_concurrent_requests
+        self._response_cache = response_cache
+        # Shared by every watch() of this account, so that adding watchers does not multiply the number of requests
+        self._watch_call_budget = CallBudget(watch_max_calls, watch_call_period) if watch_max_calls is not None else None
+        self._command_listeners = {}
+        self._confirmation_tracker = ConfirmationTracker({
+            "status": self.__get_uncached_vehicle_status,
+            "evStatus": self.__get_uncached_ev_vehicle_status
+        })
 
-    async def validate_credentials(self):
-        await self.controller.login()
+    async def validate_credentials(self, timeout=None):
+        await self.controller.login(timeout=timeout)
 
-    async def get_vehicles(self):
-        if self._use_cached_vehicle_list and self._cached_vehicle_list is not None:
+    async def get_vehicles(self, timeout=None):
+        if (
+            self._use_cached_vehicle_list
+            and self._cached_vehicle_list is not None
+            and (self._vehicle_list_cache_ttl is None or time.monotonic() - self._cached_vehicle_list_timestamp < self._vehicle_list_cache_ttl)
+        ):
             return self._cached_vehicle_list
 
-        vec_base_infos_response = await self.controller.get_vec_base_infos()
+        deadline = self.__get_deadline(timeout)
+
+        vec_base_infos_response = await self.controller.get_vec_base_infos(timeout=timeout)
 
         vehicles = []
         for i, current_vec_base_info in enumerate(vec_base_infos_response.get("vecBaseInfos")):
@@ -36,12 +87,10 @@ class Client:
 
             other_veh_info = json.loads(current_vec_base_info.get("Vehicle").get("vehicleInformation"))
 
-            nickname = await self.controller.get_nickname(current_vec_base_info.get("vin"))
-
             vehicle = {
                 "vin": current_vec_base_info.get("vin"),
                 "id": current_vec_base_info.get("Vehicle", {}).get("CvInformation", {}).get("internalVin"),
-                "nickname": nickname,
+                "nickname": None,
                 "carlineCode": other_veh_info.get("OtherInformation", {}).get("carlineCode"),
                 "carlineName": other_veh_info.get("OtherInformation", {}).get("carlineName"),
                 "modelYear": other_veh_info.get("OtherInformation", {}).get("modelYear"),
@@ -57,12 +106,34 @@ class Client:
 
             vehicles.append(vehicle)
 
+        # Fetch the nicknames concurrently rather than one vehicle at a time
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def get_nickname(vin):
+            nickname = self._nickname_cache.get(vin)
+            if nickname is None:
+                async with semaphore:
+                    nickname = await self.controller.get_nickname(vin, timeout=self.__get_remaining_timeout(deadline))
+                self._nickname_cache.set(vin, nickname)
+            return nickname
+
+        nicknames = await asyncio.gather(*[get_nickname(vehicle["vin"]) for vehicle in vehicles])
+        for vehicle, nickname in zip(vehicles, nicknames):
+            vehicle["nickname"] = nickname
+            self._is_electric_by_vehicle_id[vehicle["id"]] = vehicle["isElectric"]
+
         if self._use_cached_vehicle_list:
             self._cached_vehicle_list = vehicles
+            self._cached_vehicle_list_timestamp = time.monotonic()
         return vehicles
 
-    async def get_vehicle_status(self, vehicle_id):
-        vehicle_status_response = await self.controller.get_vehicle_status(vehicle_id)
+    async def get_vehicle_status(self, vehicle_id, timeout=None):
+        vehicle_status_response = await self.__read_through_cache(
+            "getVehicleStatus",
+            vehicle_id,
+            lambda: self.controller.get_vehicle_status(vehicle_id, timeout=timeout),
+            get_vehicle_status_timestamp
+        )
 
         alert_info = vehicle_status_response.get("alertInfos")[0]
         remote_info = vehicle_status_response.get("remoteInfos")[0]
@@ -112,20 +183,17 @@ class Client:
             }
         }
 
-        door_lock_status = vehicle_status["doorLocks"]
-        lock_value = not (
-            door_lock_status["driverDoorUnlocked"]
-            or door_lock_status["passengerDoorUnlocked"]
-            or door_lock_status["rearLeftDoorUnlocked"]
-            or door_lock_status["rearRightDoorUnlocked"]
-        )
-
-        self.__save_api_value(vehicle_id, "lock_state", lock_value, datetime.datetime.strptime(vehicle_status["lastUpdatedTimestamp"], "%Y%m%d%H%M%S").replace(tzinfo=datetime.timezone.utc))
+        self.__save_api_value(vehicle_id, "lock_state", get_lock_state(vehicle_status), datetime.datetime.strptime(vehicle_status["lastUpdatedTimestamp"], "%Y%m%d%H%M%S").replace(tzinfo=datetime.timezone.utc))
 
         return vehicle_status
 
-    async def get_ev_vehicle_status(self, vehicle_id):
-        ev_vehicle_status_response = await self.controller.get_ev_vehicle_status(vehicle_id)
+    async def get_ev_vehicle_status(self, vehicle_id, timeout=None):
+        ev_vehicle_status_response = await self.__read_through_cache(
+            "getEVVehicleStatus",
+            vehicle_id,
+            lambda: self.controller.get_ev_vehicle_status(vehicle_id, timeout=timeout),
+            get_ev_vehicle_status_timestamp
+        )
 
         result_data = ev_vehicle_status_response.get("resultData")[0]
         vehicle_info = result_data.get("PlusBInformation", {}).get("VehicleInfo", {})
@@ -156,6 +224,130 @@ class Client:
 
         return ev_vehicle_status
 
+    async def get_vehicle_snapshot(self, vehicle_id, is_electric=None, timeout=None):
+        deadline = self.__get_deadline(timeout)
+
+        if is_electric is None:
+            is_electric = await self.__get_is_electric(vehicle_id, timeout)
+
+        sources = {"status": self.get_vehicle_status}
+        # When it is still not known whether the vehicle is electric, try the EV endpoints too and report them as missing if they fail
+        if is_electric is not False:
+            sources["evStatus"] = self.get_ev_vehicle_status
+            sources["hvacSetting"] = self.get_hvac_setting
+
+        results = await asyncio.gather(*[get_source(vehicle_id, timeout=self.__get_remaining_timeout(deadline)) for get_source in sources.values()], return_exceptions=True)
+
+        snapshot = {
+            "status": None,
+            "evStatus": None,
+            "hvacSetting": None,
+            "missing": []
+        }
+        errors = []
+        for name, result in zip(sources.keys(), results):
+            if isinstance(result, Exception):
+                snapshot["missing"].append(name)
+                errors.append(result)
+            else:
+                snapshot[name] = result
+
+        if len(errors) == len(sources):
+            raise errors[0]
+
+        # Read the assumed values after the requests, since their results update the API values
+        snapshot["assumedLockState"] = self.get_assumed_lock_state(vehicle_id)
+        snapshot["assumedHvacMode"] = self.get_assumed_hvac_mode(vehicle_id)
+        snapshot["assumedHvacSetting"] = self.get_assumed_hvac_setting(vehicle_id)
+
+        return snapshot
+
+    async def __get_is_electric(self, vehicle_id, timeout):
+        if vehicle_id not in self._is_electric_by_vehicle_id:
+            try:
+                await self.get_vehicles(timeout=timeout)
+            except MazdaException:
+                # The snapshot falls back to trying every endpoint
+                pass
+        return self._is_electric_by_vehicle_id.get(vehicle_id)
+
+    async def iter_fleet_status(self, timeout=None):
+        deadline = self.__get_deadline(timeout)
+        vehicles = await self.get_vehicles(timeout=timeout)
+
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def get_limited(get_status, vehicle_id):
+            async with semaphore:
+                return await get_status(vehicle_id, timeout=self.__get_remaining_timeout(deadline))
+
+        async def get_fleet_status_entry(vehicle):
+            status_requests = [get_limited(self.get_vehicle_status, vehicle["id"])]
+            if vehicle["isElectric"]:
+                status_requests.append(get_limited(self.get_ev_vehicle_status, vehicle["id"]))
+
+            # A failure of one request keeps whatever the other request returned
+            results = await asyncio.gather(*status_requests, return_exceptions=True)
+            results += [None] * (2 - len(results))
+
+            errors = [result for result in results if isinstance(result, Exception)]
+            return {
+                "vehicle": vehicle,
+                "status": None if isinstance(results[0], Exception) else results[0],
+                "evStatus": None if isinstance(results[1], Exception) else results[1],
+                "error": errors[0] if errors else None
+            }
+
+        tasks = [asyncio.ensure_future(get_fleet_status_entry(vehicle)) for vehicle in vehicles]
+        try:
+            for next_entry in asyncio.as_completed(tasks):
+                yield await next_entry
+        finally:
+            # Stop fetching if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def watch(self, vehicle_id, min_interval=30, max_interval=1800, backoff_multiplier=2, timeout=None):
+        command_sent = asyncio.Event()
+        listeners = self._command_listeners.setdefault(vehicle_id, set())
+        listeners.add(command_sent)
+
+        previous_status = None
+        interval = min_interval
+        try:
+            while True:
+                if self._watch_call_budget is not None:
+                    await self._watch_call_budget.acquire()
+
+                # Commands sent from here on are picked up by the wait below, even while the caller handles a change
+                command_sent.clear()
+                status = await self.get_vehicle_status(vehicle_id, timeout=timeout)
+                changes = diff_vehicle_status(previous_status, status)
+                previous_status = status
+
+                if changes:
+                    yield {"status": status, "changes": changes}
+
+                # Poll quickly while the vehicle is moving, and back off while it is parked
+                if is_vehicle_active(changes):
+                    interval = min_interval
+                else:
+                    interval = min(max_interval, interval * backoff_multiplier)
+
+                try:
+                    await asyncio.wait_for(command_sent.wait(), interval)
+                except asyncio.TimeoutError:
+                    continue
+
+                # A command was sent, so give the vehicle a moment to act on it and then poll quickly again
+                interval = min_interval
+                await asyncio.sleep(min_interval)
+        finally:
+            listeners.discard(command_sent)
+            if not listeners:
+                del self._command_listeners[vehicle_id]
+
     def get_assumed_lock_state(self, vehicle_id):
         return self.__get_assumed_value(vehicle_id, "lock_state", datetime.timedelta(seconds=600))
 
@@ -165,39 +357,48 @@ class Client:
     def get_assumed_hvac_setting(self, vehicle_id):
         return self.__get_assumed_value(vehicle_id, "hvac_setting", datetime.timedelta(seconds=600))
 
-    async def turn_on_hazard_lights(self, vehicle_id):
-        await self.controller.light_on(vehicle_id)
+    async def get_health_report(self, vehicle_id, timeout=None):
+        return await self.__read_through_cache("getHealthReport", vehicle_id, lambda: self.controller.get_health_report(vehicle_id, timeout=timeout))
+
+    async def turn_on_hazard_lights(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.light_on(vehicle_id, timeout=timeout))
 
-    async def turn_off_hazard_lights(self, vehicle_id):
-        await self.controller.light_off(vehicle_id)
+    async def turn_off_hazard_lights(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.light_off(vehicle_id, timeout=timeout))
 
-    async def unlock_doors(self, vehicle_id):
+    async def unlock_doors(self, vehicle_id, timeout=None, wait_for_confirmation=False, confirmation_timeout=120):
         self.__save_assumed_value(vehicle_id, "lock_state", False)
 
-        await self.controller.door_unlock(vehicle_id)
+        await self.__send_command(vehicle_id, self.controller.door_unlock(vehicle_id, timeout=timeout))
 
-    async def lock_doors(self, vehicle_id):
+        if wait_for_confirmation:
+            await self.__wait_for_confirmation(vehicle_id, "lock_state", False, confirmation_timeout)
+
+    async def lock_doors(self, vehicle_id, timeout=None, wait_for_confirmation=False, confirmation_timeout=120):
         self.__save_assumed_value(vehicle_id, "lock_state", True)
 
-        await self.controller.door_lock(vehicle_id)
+        await self.__send_command(vehicle_id, self.controller.door_lock(vehicle_id, timeout=timeout))
+
+        if wait_for_confirmation:
+            await self.__wait_for_confirmation(vehicle_id, "lock_state", True, confirmation_timeout)
 
-    async def start_engine(self, vehicle_id):
-        await self.controller.engine_start(vehicle_id)
+    async def start_engine(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.engine_start(vehicle_id, timeout=timeout))
 
-    async def stop_engine(self, vehicle_id):
-        await self.controller.engine_stop(vehicle_id)
+    async def stop_engine(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.engine_stop(vehicle_id, timeout=timeout))
 
-    async def send_poi(self, vehicle_id, latitude, longitude, name):
-        await self.controller.send_poi(vehicle_id, latitude, longitude, name)
+    async def send_poi(self, vehicle_id, latitude, longitude, name, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.send_poi(vehicle_id, latitude, longitude, name, timeout=timeout))
 
-    async def start_charging(self, vehicle_id):
-        await self.controller.charge_start(vehicle_id)
+    async def start_charging(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.charge_start(vehicle_id, timeout=timeout))
 
-    async def stop_charging(self, vehicle_id):
-        await self.controller.charge_stop(vehicle_id)
+    async def stop_charging(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.charge_stop(vehicle_id, timeout=timeout))
 
-    async def get_hvac_setting(self, vehicle_id):
-        response = await self.controller.get_hvac_setting(vehicle_id)
+    async def get_hvac_setting(self, vehicle_id, timeout=None):
+        response = await self.__read_through_cache("getHVACSetting", vehicle_id, lambda: self.controller.get_hvac_setting(vehicle_id, timeout=timeout))
 
         response_hvac_settings = response.get("hvacSettings", {})
 
@@ -212,7 +413,7 @@ class Client:
 
         return hvac_setting
 
-    async def set_hvac_setting(self, vehicle_id, temperature, temperature_unit, front_defroster, rear_defroster):
+    async def set_hvac_setting(self, vehicle_id, temperature, temperature_unit, front_defroster, rear_defroster, timeout=None):
         self.__save_assumed_value(vehicle_id, "hvac_setting", {
             "temperature": temperature,
             "temperatureUnit": temperature_unit,
@@ -220,27 +421,118 @@ class Client:
             "rearDefroster": rear_defroster
         })
 
-        await self.controller.set_hvac_setting(vehicle_id, temperature, temperature_unit, front_defroster, rear_defroster)
+        await self.__send_command(vehicle_id, self.controller.set_hvac_setting(vehicle_id, temperature, temperature_unit, front_defroster, rear_defroster, timeout=timeout))
 
-    async def turn_on_hvac(self, vehicle_id):
+    async def turn_on_hvac(self, vehicle_id, timeout=None, wait_for_confirmation=False, confirmation_timeout=120):
         self.__save_assumed_value(vehicle_id, "hvac_mode", True)
 
-        await self.controller.hvac_on(vehicle_id)
+        await self.__send_command(vehicle_id, self.controller.hvac_on(vehicle_id, timeout=timeout))
+
+        if wait_for_confirmation:
+            await self.__wait_for_confirmation(vehicle_id, "hvac_mode", True, confirmation_timeout)
 
-    async def turn_off_hvac(self, vehicle_id):
+    async def turn_off_hvac(self, vehicle_id, timeout=None, wait_for_confirmation=False, confirmation_timeout=120):
         self.__save_assumed_value(vehicle_id, "hvac_mode", False)
 
-        await self.controller.hvac_off(vehicle_id)
+        await self.__send_command(vehicle_id, self.controller.hvac_off(vehicle_id, timeout=timeout))
+
+        if wait_for_confirmation:
+            await self.__wait_for_confirmation(vehicle_id, "hvac_mode", False, confirmation_timeout)
+
+    async def refresh_vehicle_status(self, vehicle_id, timeout=None):
+        await self.__send_command(vehicle_id, self.controller.refresh_vehicle_status(vehicle_id, timeout=timeout))
+
+    async def refresh_and_get_status(self, vehicle_id, timeout=120, initial_delay=10, max_interval=30, backoff_multiplier=1.5):
+        deadline = self.__get_deadline(timeout)
+        refresh_timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
+
+        await self.refresh_vehicle_status(vehicle_id, timeout=self.__get_remaining_timeout(deadline))
+
+        # The vehicle needs some time to report in, so polling right away would only waste requests
+        delay = initial_delay
+        while True:
+            remaining_timeout = self.__get_remaining_timeout(deadline)
+            if remaining_timeout is not None:
+                if remaining_timeout <= 0:
+                    raise MazdaRequestTimeoutException("Vehicle status was not refreshed before the timeout")
+                delay = min(delay, remaining_timeout)
+            await asyncio.sleep(delay)
+
+            # Always ask the API, since a cached status would be older than the refresh
+            self.__invalidate_cached_responses(vehicle_id, ["getVehicleStatus"])
+            vehicle_status = await self.get_vehicle_status(vehicle_id, timeout=self.__get_remaining_timeout(deadline))
 
-    async def refresh_vehicle_status(self, vehicle_id):
-        await self.controller.refresh_vehicle_status(vehicle_id)
+            # Timestamps have the form YYYYMMDDhhmmss, so they compare correctly as strings
+            if vehicle_status["lastUpdatedTimestamp"] is not None and vehicle_status["lastUpdatedTimestamp"] >= refresh_timestamp:
+                return vehicle_status
 
-    async def update_vehicle_nickname(self, vin, new_nickname):
-        await self.controller.update_nickname(vin, new_nickname)
+            delay = min(max_interval, delay * backoff_multiplier)
+
+    async def update_vehicle_nickname(self, vin, new_nickname, timeout=None):
+        await self.controller.update_nickname(vin, new_nickname, timeout=timeout)
+
+        # Apply the new nickname locally so that it does not need to be fetched again
+        self._nickname_cache.set(vin, new_nickname)
+        if self._cached_vehicle_list is not None:
+            for vehicle in self._cached_vehicle_list:
+                if vehicle["vin"] == vin:
+                    vehicle["nickname"] = new_nickname
+
+    def start_token_refresh(self, margin=300, jitter=120):
+        self.controller.connection.start_token_refresh(margin, jitter)
+
+    async def stop_token_refresh(self):
+        await self.controller.connection.stop_token_refresh()
 
     async def close(self):
+        # The response cache is supplied by the caller and may be shared with other clients, so it is left open
+        await self._confirmation_tracker.close()
         await self.controller.close()
 
+    async def __read_through_cache(self, endpoint, vehicle_id, fetch, get_upstream_timestamp=None):
+        if self._response_cache is None:
+            return await fetch()
+        return await self._response_cache.get(endpoint, vehicle_id, fetch, get_upstream_timestamp)
+
+    async def __send_command(self, vehicle_id, command):
+        try:
+            return await command
+        finally:
+            # Cached readings no longer reflect the vehicle once a command has been sent
+            self.__invalidate_cached_responses(vehicle_id)
+            for command_sent in self._command_listeners.get(vehicle_id, ()):
+                command_sent.set()
+
+    async def __wait_for_confirmation(self, vehicle_id, key, value, timeout):
+        source, get_value = CONFIRMATION_SOURCES[key]
+        await self._confirmation_tracker.wait(vehicle_id, source, lambda status: get_value(status) == value, timeout)
+
+        # The API now reports the requested value, so it no longer needs to be assumed
+        cached_state = self.__get_cached_state(vehicle_id)
+        if cached_state.get("assumed_" + key) == value:
+            cached_state.pop("assumed_" + key)
+            cached_state.pop("assumed_" + key + "_timestamp", None)
+        self.__save_api_value(vehicle_id, key, value)
+
+    async def __get_uncached_vehicle_status(self, vehicle_id):
+        self.__invalidate_cached_responses(vehicle_id, ["getVehicleStatus"])
+        return await self.get_vehicle_status(vehicle_id)
+
+    async def __get_uncached_ev_vehicle_status(self, vehicle_id):
+        self.__invalidate_cached_responses(vehicle_id, ["getEVVehicleStatus"])
+        return await self.get_ev_vehicle_status(vehicle_id)
+
+    def __invalidate_cached_responses(self, vehicle_id, endpoints=None):
+        if self._response_cache is not None:
+            self._response_cache.invalidate(vehicle_id, endpoints)
+
+    def __get_deadline(self, timeout):
+        return None if timeout is None else time.monotonic() + timeout
+
+    def __get_remaining_timeout(self, deadline):
+        # Calls which make several requests share one deadline, so each request gets whatever time is left
+        return None if deadline is None else deadline - time.monotonic()
+
     def __get_assumed_value(self, vehicle_id, key, assumed_state_validity_duration):
         cached_state = self.__get_cached_state(vehicle_id)
 
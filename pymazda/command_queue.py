@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import deque
+
+from pymazda.exceptions import MazdaCommandSupersededException, MazdaException, MazdaRequestTimeoutException
+
+class QueuedCommand:
+    def __init__(self, command_key, supersede_group, coro_func, deadline):
+        self.command_key = command_key
+        self.supersede_group = supersede_group
+        self.coro_func = coro_func
+        self.deadline = deadline
+        self.timeout_handle = None
+        self.finished = False
+        # One future per caller, so that one caller cancelling (e.g. on a timeout) does not cancel the command for the others
+        self.waiters = []
+
+class CommandQueue:
+    """Runs remote commands one at a time for each vehicle, while commands for different vehicles run in parallel"""
+
+    def __init__(self):
+        self._pending_commands = {}
+        self._workers = {}
+
+    def submit(self, vehicle_key, command_key, coro_func, supersede_group=None, timeout=None):
+        loop = asyncio.get_running_loop()
+        pending_commands = self._pending_commands.setdefault(vehicle_key, deque())
+
+        # An identical command which has not started yet already covers this request
+        for pending_command in pending_commands:
+            if pending_command.command_key == command_key:
+                return self.__add_waiter(vehicle_key, pending_command)
+
+        # A newer command in the same group (e.g. lock after unlock) makes older pending ones pointless
+        if supersede_group is not None:
+            for pending_command in list(pending_commands):
+                if pending_command.supersede_group == supersede_group:
+                    pending_commands.remove(pending_command)
+                    self.__finish(pending_command, exception=MazdaCommandSupersededException("Command was superseded by a newer command"))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        command = QueuedCommand(command_key, supersede_group, coro_func, deadline)
+        if timeout is not None:
+            command.timeout_handle = loop.call_later(timeout, self.__expire, vehicle_key, command)
+        pending_commands.append(command)
+
+        if vehicle_key not in self._workers:
+            self._workers[vehicle_key] = asyncio.ensure_future(self.__run_worker(vehicle_key))
+
+        return self.__add_waiter(vehicle_key, command)
+
+    def __add_waiter(self, vehicle_key, command):
+        waiter = asyncio.get_running_loop().create_future()
+        command.waiters.append(waiter)
+        waiter.add_done_callback(lambda waiter: self.__remove_waiter(vehicle_key, command, waiter))
+        return waiter
+
+    def __remove_waiter(self, vehicle_key, command, waiter):
+        command.waiters.remove(waiter)
+        if command.waiters or command.finished:
+            return
+
+        # Nobody is waiting for the command anymore, so it is dropped if it has not started yet
+        pending_commands = self._pending_commands.get(vehicle_key)
+        if pending_commands is not None and command in pending_commands:
+            pending_commands.remove(command)
+            self.__finish(command)
+
+    async def __run_worker(self, vehicle_key):
+        pending_commands = self._pending_commands[vehicle_key]
+        command = None
+        try:
+            while pending_commands:
+                command = pending_commands.popleft()
+                if command.timeout_handle is not None:
+                    command.timeout_handle.cancel()
+                if command.finished:
+                    # Every caller cancelled the command before it started
+                    continue
+
+                remaining_timeout = None if command.deadline is None else command.deadline - time.monotonic()
+                try:
+                    result = await command.coro_func(remaining_timeout)
+                except Exception as ex:
+                    self.__finish(command, exception=ex)
+                else:
+                    self.__finish(command, result=result)
+        finally:
+            # When the worker is cancelled by close(), the running and queued commands must not leave their callers waiting
+            if command is not None:
+                self.__finish(command, exception=MazdaException("Command was not completed because the client was closed"))
+            self.__fail_pending_commands(vehicle_key)
+            del self._workers[vehicle_key]
+
+    def __expire(self, vehicle_key, command):
+        # Commands that are already running are bounded by the request timeout instead
+        pending_commands = self._pending_commands.get(vehicle_key)
+        if pending_commands is not None and command in pending_commands:
+            pending_commands.remove(command)
+            self.__finish(command, exception=MazdaRequestTimeoutException("Command timed out while waiting for earlier commands to finish"))
+
+    def __fail_pending_commands(self, vehicle_key):
+        for command in self._pending_commands.pop(vehicle_key, ()):
+            self.__finish(command, exception=MazdaException("Command was not completed because the client was closed"))
+
+    def __finish(self, command, result=None, exception=None):
+        if command.timeout_handle is not None:
+            command.timeout_handle.cancel()
+        if command.finished:
+            return
+        command.finished = True
+
+        for waiter in list(command.waiters):
+            if waiter.done():
+                continue
+            if exception is not None:
+                waiter.set_exception(exception)
+            else:
+                waiter.set_result(result)
+
+    async def close(self):
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        # Workers cancelled before they started never reach their cleanup, so their queued commands are failed here
+        for vehicle_key in list(self._pending_commands):
+            self.__fail_pending_commands(vehicle_key)
+        self._workers.clear()
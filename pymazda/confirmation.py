@@ -0,0 +1,82 @@
+import asyncio
+import logging
+
+from pymazda.exceptions import MazdaRequestTimeoutException
+
+class PendingConfirmation:
+    def __init__(self, source, is_confirmed, future):
+        self.source = source
+        self.is_confirmed = is_confirmed
+        self.future = future
+
+class ConfirmationTracker:
+    """Polls vehicle status until commands take effect, sharing each poll between all commands waiting on the same vehicle"""
+
+    def __init__(self, status_sources, initial_interval=5, max_interval=30, backoff_multiplier=1.5):
+        # Maps a source name to a coroutine function which fetches that kind of status for a vehicle ID
+        self.status_sources = status_sources
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_multiplier = backoff_multiplier
+
+        self._pending_confirmations = {}
+        self._intervals = {}
+        self._pollers = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    async def wait(self, vehicle_id, source, is_confirmed, timeout=None):
+        confirmation = PendingConfirmation(source, is_confirmed, asyncio.get_running_loop().create_future())
+        self._pending_confirmations.setdefault(vehicle_id, []).append(confirmation)
+
+        # A new command restarts the backoff, since the vehicle is about to change again
+        self._intervals[vehicle_id] = self.initial_interval
+        if vehicle_id not in self._pollers:
+            self._pollers[vehicle_id] = asyncio.ensure_future(self.__poll(vehicle_id))
+
+        try:
+            return await asyncio.wait_for(confirmation.future, timeout)
+        except asyncio.TimeoutError:
+            raise MazdaRequestTimeoutException("Command was not confirmed before the timeout")
+        finally:
+            pending_confirmations = self._pending_confirmations.get(vehicle_id)
+            if pending_confirmations is not None and confirmation in pending_confirmations:
+                pending_confirmations.remove(confirmation)
+
+    async def __poll(self, vehicle_id):
+        try:
+            while self._pending_confirmations.get(vehicle_id):
+                await asyncio.sleep(self._intervals[vehicle_id])
+
+                pending_confirmations = list(self._pending_confirmations.get(vehicle_id, ()))
+                if not pending_confirmations:
+                    break
+
+                sources = list({confirmation.source for confirmation in pending_confirmations})
+                results = await asyncio.gather(*[self.status_sources[source](vehicle_id) for source in sources], return_exceptions=True)
+                statuses = dict(zip(sources, results))
+
+                for confirmation in pending_confirmations:
+                    status = statuses[confirmation.source]
+                    if isinstance(status, Exception):
+                        # Keep polling, the caller's timeout decides when to give up
+                        self.logger.debug("Polling %s for command confirmation failed: %s", confirmation.source, status)
+                    elif not confirmation.future.done() and confirmation.is_confirmed(status):
+                        confirmation.future.set_result(status)
+
+                self._intervals[vehicle_id] = min(self.max_interval, self._intervals[vehicle_id] * self.backoff_multiplier)
+        finally:
+            del self._pollers[vehicle_id]
+            self._intervals.pop(vehicle_id, None)
+            if not self._pending_confirmations.get(vehicle_id):
+                self._pending_confirmations.pop(vehicle_id, None)
+
+    async def close(self):
+        for pending_confirmations in self._pending_confirmations.values():
+            for confirmation in pending_confirmations:
+                confirmation.future.cancel()
+
+        pollers = list(self._pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
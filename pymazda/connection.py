@@ -1,16 +1,18 @@
 import aiohttp
 import asyncio
 import base64
+import functools
 import hashlib
 import json
 import logging
+import random
 import ssl
 import time
 from urllib.parse import urlencode
 
+from pymazda.cache_utils import LRUCache
 from pymazda.crypto_utils import (
-    encrypt_aes128cbc_buffer_to_base64_str,
-    decrypt_aes128cbc_buffer_to_str,
+    AES128CBCCipher,
     encrypt_rsaecbpkcs1_padding,
     generate_uuid_from_seed,
     generate_usher_device_id_from_seed
@@ -24,9 +26,11 @@ from pymazda.exceptions import (
     MazdaAccountLockedException,
     MazdaTokenExpiredException,
     MazdaLoginFailedException,
-    MazdaRequestInProgressException
+    MazdaRequestInProgressException,
+    MazdaRequestTimeoutException
 )
 
+from pymazda.retry import RetryAttempt, RetryPolicy
 from pymazda.sensordata.sensor_data_builder import SensorDataBuilder
 
 ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
@@ -60,14 +64,65 @@ APP_OS = "Android"
 APP_VERSION = "8.4.2"
 USHER_SDK_VERSION = "11.3.0700.001"
 
-MAX_RETRIES = 4
+ENCRYPTED_PAYLOAD_CACHE_SIZE = 4096
+MIN_TOKEN_REFRESH_INTERVAL = 60
+MAX_TOKEN_REFRESH_RETRY_INTERVAL = 3600
+
+SIGN_WITH_TIMESTAMP = "timestamp"
+SIGN_WITH_QUERY = "query"
+SIGN_WITH_BODY = "body"
+
+@functools.lru_cache(maxsize=None)
+def derive_keys_from_app_code(app_code):
+    val1 = hashlib.md5((app_code + APP_PACKAGE_ID).encode()).hexdigest().upper()
+    val2 = hashlib.md5((val1 + SIGNATURE_MD5).encode()).hexdigest().lower()
+
+    decryption_cipher = AES128CBCCipher(val2[4:20], IV)
+    temporary_sign_key = val2[20:32] + val2[0:10] + val2[4:6]
+    return decryption_cipher, temporary_sign_key
+
+class KeyMaterial:
+    """Values derived from a pair of encryption and signing keys, kept for as long as those keys are in use"""
+
+    def __init__(self, enc_key, sign_key):
+        self.enc_key = enc_key
+        self.sign_key = sign_key
+        self.cipher = AES128CBCCipher(enc_key, IV)
+
+        # The IV is fixed, so the encrypted form of a payload only changes when the keys are rotated
+        self.encrypted_payloads = LRUCache(ENCRYPTED_PAYLOAD_CACHE_SIZE)
+
+    def matches(self, enc_key, sign_key):
+        return self.enc_key == enc_key and self.sign_key == sign_key
+
+class ApiRoute:
+    """Describes how requests to an endpoint are signed and which key decrypts its responses"""
+
+    def __init__(self, sign_mode, decryption_cipher=None):
+        self.sign_mode = sign_mode
+        # None means the responses are decrypted using the current encryption key
+        self.decryption_cipher = decryption_cipher
+
+class InFlightRequest:
+    """An API request which is shared by every caller that sent an identical request while it was running"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.task = None
+        self.num_waiters = 0
+
+    def extend_deadline(self, deadline):
+        # The shared request keeps running for as long as any of its callers is willing to wait
+        if self.deadline is not None and (deadline is None or deadline > self.deadline):
+            self.deadline = deadline
 
 class Connection:
     """Main class for handling MyMazda API connection"""
 
-    def __init__(self, email, password, region, websession=None):
+    def __init__(self, email, password, region, websession=None, retry_policy=None, close_websession=True, credential_store=None, rate_limiter=None):
         self.email = email
         self.password = password
+        self.region = region
 
         if region in REGION_CONFIG:
             region_config = REGION_CONFIG[region]
@@ -83,17 +138,57 @@ class Connection:
         self.enc_key = None
         self.sign_key = None
 
+        self._key_material = None
+        self._app_code_cipher, self._temporary_sign_key = derive_keys_from_app_code(self.app_code)
+
         self.access_token = None
         self.access_token_expiration_ts = None
 
-        self.sensor_data_builder = SensorDataBuilder()
+        # Headers which are identical for every request made by this connection
+        self._base_api_headers = {
+            "device-id": self.base_api_device_id,
+            "app-code": self.app_code,
+            "app-os": APP_OS,
+            "user-agent": USER_AGENT_BASE_API,
+            "app-version": APP_VERSION,
+            "app-unique-id": APP_PACKAGE_ID
+        }
+
+        self._routes = {
+            "service/checkVersion": ApiRoute(SIGN_WITH_TIMESTAMP, self._app_code_cipher)
+        }
+        self._default_routes = {
+            "GET": ApiRoute(SIGN_WITH_QUERY),
+            "POST": ApiRoute(SIGN_WITH_BODY)
+        }
+        self._unsigned_route = ApiRoute(None)
+
+        self._in_flight_refreshes = {}
+        self._in_flight_requests = {}
+        self._token_refresh_task = None
+
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._retry_budget = self.retry_policy.create_account_budget()
+
+        self.credential_store = credential_store
+        self.rate_limiter = rate_limiter
+        self.logger = logging.getLogger(__name__)
+        self.__load_stored_credentials()
+
+        # Created on the first request, since building it is costly and many connections are created without being used right away
+        self._sensor_data_builder = None
 
         if websession is None:
             self._session = aiohttp.ClientSession()
         else:
             self._session = websession
+        self._close_websession = close_websession
 
-        self.logger = logging.getLogger(__name__)
+    @property
+    def sensor_data_builder(self):
+        if self._sensor_data_builder is None:
+            self._sensor_data_builder = SensorDataBuilder()
+        return self._sensor_data_builder
 
     def __get_timestamp_str_ms(self):
         return str(int(round(time.time() * 1000)))
@@ -101,15 +196,15 @@ class Connection:
     def __get_timestamp_str(self):
         return str(int(round(time.time())))
 
-    def __get_decryption_key_from_app_code(self):
-        val1 = hashlib.md5((self.app_code + APP_PACKAGE_ID).encode()).hexdigest().upper()
-        val2 = hashlib.md5((val1 + SIGNATURE_MD5).encode()).hexdigest().lower()
-        return val2[4:20]
+    def __get_key_material(self):
+        if self.enc_key is None or self.enc_key == "":
+            raise MazdaException("Missing encryption key")
 
-    def __get_temporary_sign_key_from_app_code(self):
-        val1 = hashlib.md5((self.app_code + APP_PACKAGE_ID).encode()).hexdigest().upper()
-        val2 = hashlib.md5((val1 + SIGNATURE_MD5).encode()).hexdigest().lower()
-        return val2[20:32] + val2[0:10] + val2[4:6]
+        # Rebuild the cached key material whenever the keys have been rotated
+        if self._key_material is None or not self._key_material.matches(self.enc_key, self.sign_key):
+            self._key_material = KeyMaterial(self.enc_key, self.sign_key)
+
+        return self._key_material
 
     def __get_sign_from_timestamp(self, timestamp):
         if timestamp is None or timestamp == "":
@@ -117,125 +212,270 @@ class Connection:
 
         timestamp_extended = (timestamp + timestamp[6:] + timestamp[3:]).upper()
 
-        temporary_sign_key = self.__get_temporary_sign_key_from_app_code()
-
-        return self.__get_payload_sign(timestamp_extended, temporary_sign_key).upper()
+        return self.__get_payload_sign(timestamp_extended, self._temporary_sign_key).upper()
 
-    def __get_sign_from_payload_and_timestamp(self, payload, timestamp):
+    def __get_sign_from_encrypted_payload_and_timestamp(self, encrypted_payload, timestamp):
         if timestamp is None or timestamp == "":
             return ""
         if self.sign_key is None or self.sign_key == "":
             raise MazdaException("Missing sign key")
+        if self.enc_key is None or self.enc_key == "":
+            raise MazdaException("Missing encryption key")
 
-        return self.__get_payload_sign(self.__encrypt_payload_using_key(payload) + timestamp + timestamp[6:] + timestamp[3:], self.sign_key)
+        return self.__get_payload_sign(encrypted_payload + timestamp + timestamp[6:] + timestamp[3:], self.sign_key)
 
     def __get_payload_sign(self, encrypted_payload_and_timestamp, sign_key):
         return hashlib.sha256((encrypted_payload_and_timestamp + sign_key).encode()).hexdigest().upper()
 
     def __encrypt_payload_using_key(self, payload):
-        if self.enc_key is None or self.enc_key == "":
-            raise MazdaException("Missing encryption key")
+        key_material = self.__get_key_material()
         if payload is None or payload == "":
             return ""
 
-        return encrypt_aes128cbc_buffer_to_base64_str(payload.encode("utf-8"), self.enc_key, IV)
+        return key_material.cipher.encrypt_buffer_to_base64_str(payload.encode("utf-8"))
+
+    def __encrypt_payload_dict_using_key(self, uri, payload_kind, payload_dict, serialize):
+        key_material = self.__get_key_material()
 
-    def __decrypt_payload_using_app_code(self, payload):
+        payload = None
+        try:
+            # Include the value types so that e.g. True and 1, which serialize differently, get separate entries
+            cache_key = (uri, payload_kind, tuple((key, value.__class__, value) for key, value in payload_dict.items()))
+            hash(cache_key)
+        except TypeError:
+            # Nested values are not hashable, so fall back to keying on the serialized payload
+            payload = serialize(payload_dict)
+            cache_key = (uri, payload_kind, payload)
+
+        encrypted_payload = key_material.encrypted_payloads.get(cache_key)
+        if encrypted_payload is None:
+            if payload is None:
+                payload = serialize(payload_dict)
+            encrypted_payload = self.__encrypt_payload_using_key(payload)
+            key_material.encrypted_payloads.set(cache_key, encrypted_payload)
+
+        return encrypted_payload
+
+    def __decrypt_payload_using_cipher(self, payload, cipher):
         buf = base64.b64decode(payload)
-        key = self.__get_decryption_key_from_app_code()
-        decrypted = decrypt_aes128cbc_buffer_to_str(buf, key, IV)
+        decrypted = cipher.decrypt_buffer_to_str(buf)
         return json.loads(decrypted)
 
     def __decrypt_payload_using_key(self, payload):
-        if self.enc_key is None or self.enc_key == "":
-            raise MazdaException("Missing encryption key")
-
-        buf = base64.b64decode(payload)
-        decrypted = decrypt_aes128cbc_buffer_to_str(buf, self.enc_key, IV)
-        return json.loads(decrypted)
+        key_material = self.__get_key_material()
+        return self.__decrypt_payload_using_cipher(payload, key_material.cipher)
 
     def __encrypt_payload_with_public_key(self, password, public_key):
         timestamp = self.__get_timestamp_str()
         encryptedBuffer = encrypt_rsaecbpkcs1_padding(password + ":" + timestamp, public_key)
         return base64.b64encode(encryptedBuffer).decode("utf-8")
 
-    async def api_request(self, method, uri, query_dict={}, body_dict={}, needs_keys=True, needs_auth=False):
-        return await self.__api_request_retry(method, uri, query_dict, body_dict, needs_keys, needs_auth, num_retries=0)
+    def __get_deadline(self, timeout):
+        if timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + timeout
 
-    async def __api_request_retry(self, method, uri, query_dict={}, body_dict={}, needs_keys=True, needs_auth=False, num_retries=0):
-        if num_retries > MAX_RETRIES:
-            raise MazdaException("Request exceeded max number of retries")
+    def __get_remaining_time(self, deadline):
+        if deadline is None:
+            return None
+        return deadline - asyncio.get_running_loop().time()
 
-        if needs_keys:
-            await self.__ensure_keys_present()
-        if needs_auth:
-            await self.__ensure_token_is_valid()
+    async def __run_with_deadline(self, coro, deadline):
+        if deadline is None:
+            return await coro
 
-        retry_message = (" - attempt #" + str(num_retries + 1)) if (num_retries > 0) else ""
-        self.logger.debug(f"Sending {method} request to {uri}{retry_message}")
+        remaining_time = self.__get_remaining_time(deadline)
+        if remaining_time <= 0:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise MazdaRequestTimeoutException("Request timed out")
 
         try:
-            return await self.__send_api_request(method, uri, query_dict, body_dict, needs_keys, needs_auth)
-        except (MazdaAPIEncryptionException):
-            self.logger.info("Server reports request was not encrypted properly. Retrieving new encryption keys.")
-            await self.__retrieve_keys()
-            return await self.__api_request_retry(method, uri, query_dict, body_dict, needs_keys, needs_auth, num_retries + 1)
-        except (MazdaTokenExpiredException):
-            self.logger.info("Server reports access token was expired. Retrieving new access token.")
-            await self.login()
-            return await self.__api_request_retry(method, uri, query_dict, body_dict, needs_keys, needs_auth, num_retries + 1)
-        except (MazdaLoginFailedException):
-            self.logger.warning("Login failed for an unknown reason. Trying again.")
-            await self.login()
-            return await self.__api_request_retry(method, uri, query_dict, body_dict, needs_keys, needs_auth, num_retries + 1)
-        except (MazdaRequestInProgressException):
-            self.logger.info("Request failed because another request was already in progress. Waiting 30 seconds and trying again.")
-            await asyncio.sleep(30)
-            return await self.__api_request_retry(method, uri, query_dict, body_dict, needs_keys, needs_auth, num_retries + 1)
-
-    async def __send_api_request(self, method, uri, query_dict={}, body_dict={}, needs_keys=True, needs_auth=False):
-        timestamp = self.__get_timestamp_str_ms()
-
-        original_query_str = ""
-        encrypted_query_dict = {}
+            # Key retrieval and login run as shielded shared tasks, so timing out here never leaves them half-finished
+            return await asyncio.wait_for(coro, remaining_time)
+        except asyncio.TimeoutError:
+            if self.__get_remaining_time(deadline) > 0:
+                raise
+            raise MazdaRequestTimeoutException("Request timed out")
+
+    async def __run_with_request_deadline(self, coro, request):
+        if request.deadline is None:
+            return await coro
+
+        # Callers joining a shared request can extend its deadline while a step is running, so the wait is re-armed until the latest deadline
+        task = asyncio.ensure_future(coro)
+        try:
+            while True:
+                remaining_time = self.__get_remaining_time(request.deadline)
+                if remaining_time is not None and remaining_time <= 0:
+                    raise MazdaRequestTimeoutException("Request timed out")
+
+                done, _ = await asyncio.wait({task}, timeout=remaining_time)
+                if done:
+                    return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def api_request(self, method, uri, query_dict={}, body_dict={}, needs_keys=True, needs_auth=False, timeout=None, deduplicate=True):
+        deadline = self.__get_deadline(timeout)
+
+        if not deduplicate:
+            return await self.__api_request_with_retries(method, uri, query_dict, body_dict, needs_keys, needs_auth, InFlightRequest(deadline))
+
+        request_key = (method, uri, json.dumps(query_dict, sort_keys=True, default=str), json.dumps(body_dict, sort_keys=True, default=str), needs_keys, needs_auth)
+        request = self._in_flight_requests.get(request_key)
+
+        if request is None:
+            request = InFlightRequest(deadline)
+            request.task = asyncio.ensure_future(self.__api_request_with_retries(method, uri, query_dict, body_dict, needs_keys, needs_auth, request))
+            self._in_flight_requests[request_key] = request
+
+            def on_done(finished_task):
+                if self._in_flight_requests.get(request_key) is request:
+                    del self._in_flight_requests[request_key]
+                # Mark the exception as retrieved in case every waiter gave up
+                if not finished_task.cancelled():
+                    finished_task.exception()
+
+            request.task.add_done_callback(on_done)
+        else:
+            self.logger.debug(f"Sharing in-flight {method} request to {uri}")
+            request.extend_deadline(deadline)
 
+        request.num_waiters += 1
+        try:
+            # Shield the shared request so that one caller timing out or being cancelled does not affect the others
+            return await self.__run_with_deadline(asyncio.shield(request.task), deadline)
+        finally:
+            request.num_waiters -= 1
+            if request.num_waiters == 0 and not request.task.done():
+                request.task.cancel()
+
+    async def __api_request_with_retries(self, method, uri, query_dict, body_dict, needs_keys, needs_auth, request):
+        num_retries = 0
+        num_retries_by_rule = {}
+
+        while True:
+            if needs_keys:
+                await self.__run_with_request_deadline(self.__ensure_keys_present(), request)
+            if needs_auth:
+                await self.__run_with_request_deadline(self.__ensure_token_is_valid(), request)
+
+            retry_message = (" - attempt #" + str(num_retries + 1)) if (num_retries > 0) else ""
+            self.logger.debug(f"Sending {method} request to {uri}{retry_message}")
+
+            # Remember which credentials this attempt used, so that a refresh completed by a concurrent request is not repeated
+            enc_key = self.enc_key
+            access_token = self.access_token
+
+            if self.rate_limiter is not None:
+                await self.__run_with_request_deadline(self.rate_limiter.acquire_api_request((self.region, self.email), self.base_url), request)
+
+            attempt_number = num_retries + 1
+            try:
+                response = await self.__run_with_request_deadline(self.__send_api_request(method, uri, query_dict, body_dict, needs_keys, needs_auth), request)
+            except (MazdaAPIEncryptionException, MazdaTokenExpiredException, MazdaLoginFailedException, MazdaRequestInProgressException) as ex:
+                rule = self.retry_policy.get_rule(ex)
+
+                num_retries += 1
+                if rule is not None:
+                    num_retries_by_rule[rule] = num_retries_by_rule.get(rule, 0) + 1
+
+                # Decide whether to retry first, so that the hooks learn the outcome of this attempt before anything is raised
+                delay = None
+                final_error = None
+                if rule is None:
+                    final_error = ex
+                elif num_retries > self.retry_policy.max_retries or (rule.max_retries is not None and num_retries_by_rule[rule] > rule.max_retries):
+                    final_error = MazdaException("Request exceeded max number of retries")
+                elif not self._retry_budget.try_acquire():
+                    final_error = MazdaException("Request exceeded the retry budget for this account")
+                else:
+                    delay = rule.get_delay(num_retries_by_rule[rule])
+
+                    remaining_time = self.__get_remaining_time(request.deadline)
+                    if remaining_time is not None and delay >= remaining_time:
+                        final_error = MazdaRequestTimeoutException("Not enough time remaining before the deadline to retry the request")
+                        delay = None
+
+                self.retry_policy.notify_attempt(RetryAttempt(method, uri, attempt_number, ex, delay))
+
+                if final_error is ex:
+                    raise
+                if final_error is not None:
+                    raise final_error from ex
+                if isinstance(ex, MazdaAPIEncryptionException):
+                    self.logger.info("Server reports request was not encrypted properly. Retrieving new encryption keys.")
+                    if self.enc_key == enc_key:
+                        await self.__run_with_request_deadline(self.__retrieve_keys(), request)
+                elif isinstance(ex, MazdaTokenExpiredException):
+                    self.logger.info("Server reports access token was expired. Retrieving new access token.")
+                    if self.access_token == access_token:
+                        await self.__run_with_request_deadline(self.login(), request)
+                elif isinstance(ex, MazdaLoginFailedException):
+                    self.logger.warning("Login failed for an unknown reason. Trying again.")
+                    await self.__run_with_request_deadline(self.login(), request)
+                elif isinstance(ex, MazdaRequestInProgressException):
+                    self.logger.info(f"Request failed because another request was already in progress. Waiting {delay:.1f} seconds and trying again.")
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            except Exception as ex:
+                self.retry_policy.notify_attempt(RetryAttempt(method, uri, attempt_number, ex, None))
+                raise
+            else:
+                self.retry_policy.notify_attempt(RetryAttempt(method, uri, attempt_number, None, None))
+                return response
+
+    def __get_route(self, method, uri):
+        route = self._routes.get(uri)
+        if route is None:
+            route = self._default_routes.get(method, self._unsigned_route)
+        return route
+
+    def __build_request_envelope(self, route, uri, query_dict, body_dict, timestamp):
+        # Each payload is serialized and encrypted exactly once, and the signature is derived from the encrypted form
+        encrypted_query_str = ""
         if query_dict:
-            original_query_str = urlencode(query_dict)
-            encrypted_query_dict["params"] = self.__encrypt_payload_using_key(original_query_str)
+            encrypted_query_str = self.__encrypt_payload_dict_using_key(uri, "query", query_dict, urlencode)
 
-        original_body_str = ""
-        encrypted_body_Str = ""
+        encrypted_body_str = ""
         if body_dict:
-            original_body_str = json.dumps(body_dict)
-            encrypted_body_Str = self.__encrypt_payload_using_key(original_body_str)
+            encrypted_body_str = self.__encrypt_payload_dict_using_key(uri, "body", body_dict, json.dumps)
 
-        headers = {
-            "device-id": self.base_api_device_id,
-            "app-code": self.app_code,
-            "app-os": APP_OS,
-            "user-agent": USER_AGENT_BASE_API,
-            "app-version": APP_VERSION,
-            "app-unique-id": APP_PACKAGE_ID,
-            "access-token": (self.access_token if needs_auth else ""),
-            "X-acf-sensor-data": self.sensor_data_builder.generate_sensor_data(),
-            "req-id": "req_" + timestamp,
-            "timestamp": timestamp
-        }
+        sign = None
+        if route.sign_mode == SIGN_WITH_TIMESTAMP:
+            sign = self.__get_sign_from_timestamp(timestamp)
+        elif route.sign_mode == SIGN_WITH_QUERY:
+            sign = self.__get_sign_from_encrypted_payload_and_timestamp(encrypted_query_str, timestamp)
+        elif route.sign_mode == SIGN_WITH_BODY:
+            sign = self.__get_sign_from_encrypted_payload_and_timestamp(encrypted_body_str, timestamp)
+
+        return encrypted_body_str, sign
 
-        if "checkVersion" in uri:
-            headers["sign"] = self.__get_sign_from_timestamp(timestamp)
-        elif method == "GET":
-            headers["sign"] = self.__get_sign_from_payload_and_timestamp(original_query_str, timestamp)
-        elif method == "POST":
-            headers["sign"] = self.__get_sign_from_payload_and_timestamp(original_body_str, timestamp)
+    async def __send_api_request(self, method, uri, query_dict={}, body_dict={}, needs_keys=True, needs_auth=False):
+        timestamp = self.__get_timestamp_str_ms()
 
-        response = await self._session.request(method, self.base_url + uri, headers=headers, data=encrypted_body_Str, ssl=ssl_context)
+        route = self.__get_route(method, uri)
+        encrypted_body_str, sign = self.__build_request_envelope(route, uri, query_dict, body_dict, timestamp)
+
+        headers = self._base_api_headers.copy()
+        headers["access-token"] = self.access_token if needs_auth else ""
+        headers["X-acf-sensor-data"] = self.sensor_data_builder.generate_sensor_data()
+        headers["req-id"] = "req_" + timestamp
+        headers["timestamp"] = timestamp
+
+        if sign is not None:
+            headers["sign"] = sign
+
+        response = await self._session.request(method, self.base_url + uri, headers=headers, data=encrypted_body_str, ssl=ssl_context)
 
         response_json = await response.json()
 
         if response_json.get("state") == "S":
-            if "checkVersion" in uri:
-                return self.__decrypt_payload_using_app_code(response_json["payload"])
+            if route.decryption_cipher is not None:
+                return self.__decrypt_payload_using_cipher(response_json["payload"], route.decryption_cipher)
             else:
                 decrypted_payload = self.__decrypt_payload_using_key(response_json["payload"])
                 self.logger.debug("Response payload: %s", decrypted_payload)
@@ -268,17 +508,55 @@ class Connection:
         if self.access_token is None or self.access_token_expiration_ts is None or self.access_token_expiration_ts <= time.time():
             await self.login()
 
+    async def __run_single_flight(self, name, coro_func):
+        # Concurrent callers share a single in-flight refresh and all receive its result or exception
+        task = self._in_flight_refreshes.get(name)
+
+        if task is not None and task is asyncio.current_task():
+            # Re-entrant call made from within the refresh itself
+            return await coro_func()
+
+        if task is None:
+            task = asyncio.ensure_future(coro_func())
+            self._in_flight_refreshes[name] = task
+
+            def on_done(finished_task):
+                if self._in_flight_refreshes.get(name) is finished_task:
+                    del self._in_flight_refreshes[name]
+                # Mark the exception as retrieved in case every waiter was cancelled
+                if not finished_task.cancelled():
+                    finished_task.exception()
+
+            task.add_done_callback(on_done)
+
+        # Shield the shared task so that one cancelled waiter does not cancel it for the others
+        return await asyncio.shield(task)
+
     async def __retrieve_keys(self):
+        await self.__run_single_flight("keys", self.__retrieve_keys_uncoalesced)
+
+    async def __retrieve_keys_uncoalesced(self):
         self.logger.info("Retrieving encryption keys")
-        response = await self.api_request("POST", "service/checkVersion", needs_keys=False, needs_auth=False)
+        # Not deduplicated, so that the request runs within the key refresh and a retry which refreshes the keys again is recognized as re-entrant
+        response = await self.api_request("POST", "service/checkVersion", needs_keys=False, needs_auth=False, deduplicate=False)
         self.logger.info("Successfully retrieved encryption keys")
 
         self.enc_key = response["encKey"]
         self.sign_key = response["signKey"]
+        self._key_material = None
+        self.__save_stored_credentials()
 
-    async def login(self):
+    async def login(self, timeout=None):
+        await self.__run_with_deadline(self.__run_single_flight("login", self.__login_uncoalesced), self.__get_deadline(timeout))
+
+    async def __acquire_login_request(self):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_login_request((self.region, self.email), self.usher_url)
+
+    async def __login_uncoalesced(self):
         self.logger.info("Logging in as " + self.email)
         self.logger.info("Retrieving public key to encrypt password")
+        await self.__acquire_login_request()
         encryption_key_response = await self._session.request(
             "GET",
             self.usher_url + "system/encryptionKey",
@@ -301,6 +579,7 @@ class Connection:
         version_prefix = encryption_key_response_json["data"]["versionPrefix"]
 
         self.logger.info("Sending login request")
+        await self.__acquire_login_request()
         login_response = await self._session.request(
             "POST",
             self.usher_url + "user/login",
@@ -334,6 +613,87 @@ class Connection:
         self.logger.info("Successfully logged in as " + self.email)
         self.access_token = login_response_json["data"]["accessToken"]
         self.access_token_expiration_ts = login_response_json["data"]["accessTokenExpirationTs"]
+        self.__save_stored_credentials()
+
+    def __load_stored_credentials(self):
+        if self.credential_store is None:
+            return
+
+        try:
+            credentials = self.credential_store.load(self.email, self.region)
+        except Exception:
+            self.logger.exception("Failed to load stored credentials")
+            return
+
+        if credentials is None:
+            return
+
+        self.logger.info("Using stored credentials for " + self.email)
+        self.enc_key = credentials.get("enc_key")
+        self.sign_key = credentials.get("sign_key")
+        self.access_token = credentials.get("access_token")
+        self.access_token_expiration_ts = credentials.get("access_token_expiration_ts")
+
+    def __save_stored_credentials(self):
+        if self.credential_store is None:
+            return
+
+        try:
+            self.credential_store.save(self.email, self.region, {
+                "enc_key": self.enc_key,
+                "sign_key": self.sign_key,
+                "access_token": self.access_token,
+                "access_token_expiration_ts": self.access_token_expiration_ts
+            })
+        except Exception:
+            # Failing to persist credentials only costs an extra login after the next restart
+            self.logger.exception("Failed to save stored credentials")
+
+    def start_token_refresh(self, margin=300, jitter=120):
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = asyncio.ensure_future(self.__run_token_refresh(margin, jitter))
+
+    async def stop_token_refresh(self):
+        task = self._token_refresh_task
+        self._token_refresh_task = None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def __run_token_refresh(self, margin, jitter):
+        num_failures = 0
+        while True:
+            # Only existing tokens are refreshed. The first login happens on the first request, so that many accounts starting together do not all log in at once
+            if self.access_token is None or self.access_token_expiration_ts is None:
+                await asyncio.sleep(MIN_TOKEN_REFRESH_INTERVAL)
+                continue
+
+            # Refresh a random amount of time ahead of the margin, so that accounts which logged in together do not all refresh together
+            refresh_offset = margin + random.uniform(0, jitter)
+            await asyncio.sleep(max(self.access_token_expiration_ts - refresh_offset - time.time(), 0))
+
+            # A request or another refresh may have replaced the token while sleeping
+            if self.access_token is not None and self.access_token_expiration_ts is not None and self.access_token_expiration_ts - time.time() > refresh_offset:
+                continue
+
+            try:
+                self.logger.info("Refreshing access token ahead of expiration")
+                await self.login()
+            except (MazdaAuthenticationException, MazdaAccountLockedException):
+                # Logging in again with rejected credentials would only get the account locked, or keep it locked
+                self.logger.exception("Background access token refresh stopped because the login was rejected")
+                return
+            except Exception:
+                self.logger.exception("Background access token refresh failed")
+                num_failures += 1
+                await asyncio.sleep(min(MAX_TOKEN_REFRESH_RETRY_INTERVAL, MIN_TOKEN_REFRESH_INTERVAL * (2 ** (num_failures - 1))))
+                continue
+
+            num_failures = 0
+            # Avoid logging in continuously if the token lifetime is shorter than the margin
+            await asyncio.sleep(MIN_TOKEN_REFRESH_INTERVAL)
 
     async def close(self):
-        await self._session.close()
+        await self.stop_token_refresh()
+        if self._close_websession:
+            await self._session.close()
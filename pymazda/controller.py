@@ -1,26 +1,28 @@
 import hashlib
 
+from pymazda.command_queue import CommandQueue
 from pymazda.connection import Connection
 from pymazda.exceptions import MazdaException
 
 class Controller:
-    def __init__(self, email, password, region, websession=None):
-        self.connection = Connection(email, password, region, websession)
+    def __init__(self, email, password, region, websession=None, retry_policy=None, close_websession=True, credential_store=None, rate_limiter=None):
+        self.connection = Connection(email, password, region, websession, retry_policy=retry_policy, close_websession=close_websession, credential_store=credential_store, rate_limiter=rate_limiter)
+        self.command_queue = CommandQueue()
 
-    async def login(self):
-        await self.connection.login()
+    async def login(self, timeout=None):
+        await self.connection.login(timeout=timeout)
 
-    async def get_tac(self):
-        return await self.connection.api_request("GET", "content/getTac/v4", needs_keys=True, needs_auth=False)
+    async def get_tac(self, timeout=None):
+        return await self.connection.api_request("GET", "content/getTac/v4", needs_keys=True, needs_auth=False, timeout=timeout)
 
-    async def get_language_pkg(self):
+    async def get_language_pkg(self, timeout=None):
         postBody = {"platformType": "ANDROID", "region": "MNAO", "version": "2.0.4"}
-        return await self.connection.api_request("POST", "junction/getLanguagePkg/v4", body_dict=postBody, needs_keys=True, needs_auth=False)
+        return await self.connection.api_request("POST", "junction/getLanguagePkg/v4", body_dict=postBody, needs_keys=True, needs_auth=False, timeout=timeout)
 
-    async def get_vec_base_infos(self):
-        return await self.connection.api_request("POST", "remoteServices/getVecBaseInfos/v4", body_dict={"internaluserid": "__INTERNAL_ID__"}, needs_keys=True, needs_auth=True)
+    async def get_vec_base_infos(self, timeout=None):
+        return await self.connection.api_request("POST", "remoteServices/getVecBaseInfos/v4", body_dict={"internaluserid": "__INTERNAL_ID__"}, needs_keys=True, needs_auth=True, timeout=timeout)
 
-    async def get_vehicle_status(self, internal_vin):
+    async def get_vehicle_status(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin,
@@ -28,7 +30,7 @@ class Controller:
             "offset": 0,
             "vecinfotype": "0"
         }
-        response = await self.connection.api_request("POST", "remoteServices/getVehicleStatus/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/getVehicleStatus/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to get vehicle status")
@@ -36,7 +38,7 @@ class Controller:
         return response
 
 
-    async def get_ev_vehicle_status(self, internal_vin):
+    async def get_ev_vehicle_status(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin,
@@ -44,14 +46,14 @@ class Controller:
             "offset": 0,
             "vecinfotype": "0"
         }
-        response = await self.connection.api_request("POST", "remoteServices/getEVVehicleStatus/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/getEVVehicleStatus/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to get EV vehicle status")
 
         return response
 
-    async def get_health_report(self, internal_vin):
+    async def get_health_report(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin,
@@ -59,92 +61,62 @@ class Controller:
             "offset": 0
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/getHealthReport/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/getHealthReport/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to get health report")
 
         return response
 
-    async def door_unlock(self, internal_vin):
+    def door_unlock(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/doorUnlock/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        return self.__queue_command(internal_vin, "remoteServices/doorUnlock/v4", post_body, "Failed to unlock door", timeout, supersede_group="doors")
 
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to unlock door")
-
-        return response
-
-    async def door_lock(self, internal_vin):
+    def door_lock(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/doorLock/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        return self.__queue_command(internal_vin, "remoteServices/doorLock/v4", post_body, "Failed to lock door", timeout, supersede_group="doors")
 
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to lock door")
-
-        return response
-
-    async def light_on(self, internal_vin):
+    def light_on(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/lightOn/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to turn light on")
-
-        return response
+        return self.__queue_command(internal_vin, "remoteServices/lightOn/v4", post_body, "Failed to turn light on", timeout, supersede_group="lights")
 
-    async def light_off(self, internal_vin):
+    def light_off(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/lightOff/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        return self.__queue_command(internal_vin, "remoteServices/lightOff/v4", post_body, "Failed to turn light off", timeout, supersede_group="lights")
 
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to turn light off")
-
-        return response
-
-    async def engine_start(self, internal_vin):
+    def engine_start(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/engineStart/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to start engine")
-
-        return response
+        return self.__queue_command(internal_vin, "remoteServices/engineStart/v4", post_body, "Failed to start engine", timeout, supersede_group="engine")
 
-    async def engine_stop(self, internal_vin):
+    def engine_stop(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/engineStop/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to stop engine")
-
-        return response
+        return self.__queue_command(internal_vin, "remoteServices/engineStop/v4", post_body, "Failed to stop engine", timeout, supersede_group="engine")
 
-    async def get_nickname(self, vin):
+    async def get_nickname(self, vin, timeout=None):
         if len(vin) != 17:
             raise MazdaException("Invalid VIN")
 
@@ -153,14 +125,14 @@ class Controller:
             "vin": vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/getNickName/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/getNickName/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to get vehicle nickname")
 
         return response["carlineDesc"]
 
-    async def update_nickname(self, vin, new_nickname):
+    async def update_nickname(self, vin, new_nickname, timeout=None):
         if len(vin) != 17:
             raise MazdaException("Invalid VIN")
         if len(new_nickname) > 20:
@@ -172,12 +144,12 @@ class Controller:
             "vtitle": new_nickname
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/updateNickName/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/updateNickName/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout, deduplicate=False)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to update vehicle nickname")
 
-    async def send_poi(self, internal_vin, latitude, longitude, name):
+    def send_poi(self, internal_vin, latitude, longitude, name, timeout=None):
         # Calculate a POI ID that is unique to the name and location
         poi_id = hashlib.sha256((str(name) + str(latitude) + str(longitude)).encode()).hexdigest()[0:10]
 
@@ -199,51 +171,38 @@ class Controller:
             ]
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/sendPOI/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to send POI")
+        return self.__queue_command(internal_vin, "remoteServices/sendPOI/v4", post_body, "Failed to send POI", timeout, command_key=("remoteServices/sendPOI/v4", poi_id))
 
-    async def charge_start(self, internal_vin):
+    def charge_start(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/chargeStart/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to start charging")
+        return self.__queue_command(internal_vin, "remoteServices/chargeStart/v4", post_body, "Failed to start charging", timeout, supersede_group="charging")
 
-        return response
-
-    async def charge_stop(self, internal_vin):
+    def charge_stop(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/chargeStop/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to stop charging")
+        return self.__queue_command(internal_vin, "remoteServices/chargeStop/v4", post_body, "Failed to stop charging", timeout, supersede_group="charging")
 
-        return response
-
-    async def get_hvac_setting(self, internal_vin):
+    async def get_hvac_setting(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/getHVACSetting/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        response = await self.connection.api_request("POST", "remoteServices/getHVACSetting/v4", body_dict=post_body, needs_keys=True, needs_auth=True, timeout=timeout)
 
         if response["resultCode"] != "200S00":
             raise MazdaException("Failed to get HVAC setting")
 
         return response
 
-    async def set_hvac_setting(self, internal_vin, temperature, temperature_unit, front_defroster, rear_defroster):
+    def set_hvac_setting(self, internal_vin, temperature, temperature_unit, front_defroster, rear_defroster, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin,
@@ -255,51 +214,45 @@ class Controller:
             }
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/updateHVACSetting/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to set HVAC setting")
-
-        return response
+        command_key = ("remoteServices/updateHVACSetting/v4", temperature, temperature_unit.lower(), front_defroster, rear_defroster)
+        return self.__queue_command(internal_vin, "remoteServices/updateHVACSetting/v4", post_body, "Failed to set HVAC setting", timeout, supersede_group="hvacSetting", command_key=command_key)
 
-    async def hvac_on(self, internal_vin):
+    def hvac_on(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/hvacOn/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        return self.__queue_command(internal_vin, "remoteServices/hvacOn/v4", post_body, "Failed to turn HVAC on", timeout, supersede_group="hvac")
 
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to turn HVAC on")
-
-        return response
-
-    async def hvac_off(self, internal_vin):
+    def hvac_off(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/hvacOff/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
-
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to turn HVAC off")
-
-        return response
+        return self.__queue_command(internal_vin, "remoteServices/hvacOff/v4", post_body, "Failed to turn HVAC off", timeout, supersede_group="hvac")
 
-    async def refresh_vehicle_status(self, internal_vin):
+    def refresh_vehicle_status(self, internal_vin, timeout=None):
         post_body = {
             "internaluserid": "__INTERNAL_ID__",
             "internalvin": internal_vin
         }
 
-        response = await self.connection.api_request("POST", "remoteServices/activeRealTimeVehicleStatus/v4", body_dict=post_body, needs_keys=True, needs_auth=True)
+        return self.__queue_command(internal_vin, "remoteServices/activeRealTimeVehicleStatus/v4", post_body, "Failed to refresh vehicle status", timeout)
 
-        if response["resultCode"] != "200S00":
-            raise MazdaException("Failed to refresh vehicle status")
+    def __queue_command(self, internal_vin, uri, post_body, failure_message, timeout, supersede_group=None, command_key=None):
+        # Remote commands are queued per vehicle, and a future for the command response is returned
+        async def send_command(remaining_timeout):
+            response = await self.connection.api_request("POST", uri, body_dict=post_body, needs_keys=True, needs_auth=True, timeout=remaining_timeout, deduplicate=False)
 
-        return response
+            if response["resultCode"] != "200S00":
+                raise MazdaException(failure_message)
+
+            return response
+
+        return self.command_queue.submit(internal_vin, command_key if command_key is not None else uri, send_command, supersede_group=supersede_group, timeout=timeout)
 
     async def close(self):
+        await self.command_queue.close()
         await self.connection.close()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import abc
+import base64
+import hashlib
+import json
+import logging
+import os
+import secrets
+import tempfile
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+SALT_FILE_NAME = "salt"
+KEY_DERIVATION_ITERATIONS = 200000
+
+class CredentialStore(abc.ABC):
+    """Interface for persisting access tokens and encryption keys across process restarts"""
+
+    @abc.abstractmethod
+    def load(self, email, region):
+        """Return the stored credentials dict for the account, or None if there are none"""
+
+    @abc.abstractmethod
+    def save(self, email, region, credentials):
+        """Store the credentials dict for the account"""
+
+class FileCredentialStore(CredentialStore):
+    """Stores credentials in a directory, one file per account, encrypted with a key derived from a secret"""
+
+    def __init__(self, directory, secret):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=self.__get_salt(), iterations=KEY_DERIVATION_ITERATIONS)
+        self._fernet = Fernet(base64.urlsafe_b64encode(kdf.derive(secret)))
+
+        self.logger = logging.getLogger(__name__)
+
+    def load(self, email, region):
+        try:
+            with open(self.__get_path(email, region), "rb") as file:
+                encrypted = file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            return json.loads(self._fernet.decrypt(encrypted))
+        except (InvalidToken, ValueError):
+            self.logger.warning("Ignoring stored credentials which could not be decrypted")
+            return None
+
+    def save(self, email, region, credentials):
+        encrypted = self._fernet.encrypt(json.dumps(credentials).encode("utf-8"))
+        self.__write_file(self.__get_path(email, region), encrypted)
+
+    def __get_path(self, email, region):
+        # Hash the account identity so that email addresses do not appear in file names
+        file_name = hashlib.sha256((region + ":" + email).encode("utf-8")).hexdigest() + ".bin"
+        return os.path.join(self.directory, file_name)
+
+    def __get_salt(self):
+        path = os.path.join(self.directory, SALT_FILE_NAME)
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            pass
+
+        # The salt is fully written before it is linked into place, and linking fails if another process got there first,
+        # so processes starting at the same time never see a partially written salt and all end up using the same one
+        temporary_path = self.__write_temporary_file(secrets.token_bytes(16))
+        try:
+            os.link(temporary_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temporary_path)
+
+        with open(path, "rb") as file:
+            return file.read()
+
+    def __write_file(self, path, data):
+        # Write to a temporary file first so that a crash or another process saving at the same time never leaves a partially written file behind
+        temporary_path = self.__write_temporary_file(data)
+        try:
+            os.replace(temporary_path, path)
+        except OSError:
+            os.remove(temporary_path)
+            raise
+
+    def __write_temporary_file(self, data):
+        # A unique name for every write, created with permissions that only allow the current user to read it
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        return temporary_path
@@ -1,27 +1,42 @@
 import base64
+import functools
 import hashlib
 from cryptography.hazmat.primitives import padding, serialization
 from cryptography.hazmat.primitives.asymmetric import padding as asymmetric_padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 
+class AES128CBCCipher:
+    """Reusable AES-128-CBC cipher for a fixed key and IV"""
+
+    def __init__(self, key, iv):
+        self.cipher = Cipher(algorithms.AES(key.encode("ascii")), modes.CBC(iv.encode("ascii")))
+
+    def encrypt_buffer_to_base64_str(self, data):
+        padder = padding.PKCS7(128).padder()
+        padded_data = padder.update(data) + padder.finalize()
+        encryptor = self.cipher.encryptor()
+        encrypted = encryptor.update(padded_data) + encryptor.finalize()
+        return base64.b64encode(encrypted).decode("utf-8")
+
+    def decrypt_buffer_to_str(self, data):
+        decryptor = self.cipher.decryptor()
+        decrypted = decryptor.update(data) + decryptor.finalize()
+        unpadder = padding.PKCS7(128).unpadder()
+        return unpadder.update(decrypted) + unpadder.finalize()
+
 def encrypt_aes128cbc_buffer_to_base64_str(data, key, iv):
-    padder = padding.PKCS7(128).padder()
-    padded_data = padder.update(data) + padder.finalize()
-    cipher = Cipher(algorithms.AES(key.encode("ascii")), modes.CBC(iv.encode("ascii")))
-    encryptor = cipher.encryptor()
-    encrypted = encryptor.update(padded_data) + encryptor.finalize()
-    return base64.b64encode(encrypted).decode("utf-8")
+    return AES128CBCCipher(key, iv).encrypt_buffer_to_base64_str(data)
 
 def decrypt_aes128cbc_buffer_to_str(data, key, iv):
-    cipher = Cipher(algorithms.AES(key.encode("ascii")), modes.CBC(iv.encode("ascii")))
-    decryptor = cipher.decryptor()
-    decrypted = decryptor.update(data) + decryptor.finalize()
-    unpadder = padding.PKCS7(128).unpadder()
-    return unpadder.update(decrypted) + unpadder.finalize()
+    return AES128CBCCipher(key, iv).decrypt_buffer_to_str(data)
+
+@functools.lru_cache(maxsize=8)
+def load_der_public_key_from_base64_str(public_key):
+    return serialization.load_der_public_key(base64.b64decode(public_key))
 
 def encrypt_rsaecbpkcs1_padding(data, public_key):
-    public_key = serialization.load_der_public_key(base64.b64decode(public_key))
+    public_key = load_der_public_key_from_base64_str(public_key)
     return public_key.encrypt(data.encode("utf-8"), asymmetric_padding.PKCS1v15())
 
 def generate_uuid_from_seed(seed):
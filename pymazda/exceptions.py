@@ -60,4 +60,28 @@ class MazdaRequestInProgressException(Exception):
     def __init__(self, status):
         """Initialize exception"""
         super(MazdaRequestInProgressException, self).__init__(status)
+        self.status = status
+
+class MazdaRequestTimeoutException(Exception):
+    """Raised when a request does not complete before its deadline"""
+
+    def __init__(self, status):
+        """Initialize exception"""
+        super(MazdaRequestTimeoutException, self).__init__(status)
+        self.status = status
+
+class MazdaCommandSupersededException(Exception):
+    """Raised when a queued command is replaced by a newer command for the same vehicle before it was sent"""
+
+    def __init__(self, status):
+        """Initialize exception"""
+        super(MazdaCommandSupersededException, self).__init__(status)
+        self.status = status
+
+class MazdaRateLimitedException(Exception):
+    """Raised when a request is not sent because the client-side rate limit was reached"""
+
+    def __init__(self, status):
+        """Initialize exception"""
+        super(MazdaRateLimitedException, self).__init__(status)
         self.status = status
\ No newline at end of file
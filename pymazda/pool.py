@@ -0,0 +1,64 @@
+import aiohttp
+import asyncio
+
+from pymazda.client import Client
+from pymazda.connection import REGION_CONFIG, ssl_context
+from pymazda.exceptions import MazdaConfigException
+
+class ClientPool:
+    """Hands out clients for many accounts which share one tuned connection pool per region"""
+
+    def __init__(self, limit_per_host=10, keepalive_timeout=60, dns_cache_ttl=300, refresh_tokens=False, token_refresh_margin=300, token_refresh_jitter=120, **client_options):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.refresh_tokens = refresh_tokens
+        self.token_refresh_margin = token_refresh_margin
+        self.token_refresh_jitter = token_refresh_jitter
+        # Extra keyword arguments which are passed to every Client created by the pool
+        self.client_options = client_options
+
+        self._sessions = {}
+        self._clients = {}
+
+    def get_client(self, email, password, region):
+        client_key = (email, region)
+        client = self._clients.get(client_key)
+        if client is None:
+            # Each client keeps its own keys and access token, but sends its requests through the shared session
+            client = Client(email, password, region, websession=self.__get_session(region), close_websession=False, **self.client_options)
+            self._clients[client_key] = client
+
+            if self.refresh_tokens:
+                client.start_token_refresh(self.token_refresh_margin, self.token_refresh_jitter)
+        return client
+
+    async def remove_client(self, email, region):
+        client = self._clients.pop((email, region), None)
+        if client is not None:
+            await client.close()
+
+    def __get_session(self, region):
+        if region not in REGION_CONFIG:
+            raise MazdaConfigException("Invalid region")
+
+        session = self._sessions.get(region)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                ssl=ssl_context
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[region] = session
+        return session
+
+    async def close(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*[client.close() for client in clients])
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*[session.close() for session in sessions])
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from pymazda.exceptions import MazdaRateLimitedException
+
+BUCKET_ACCOUNT = "account"
+BUCKET_REGION = "region"
+BUCKET_LOGIN = "login"
+
+class TokenBucket:
+    """Allows bursts of up to capacity requests, refilled at a steady number of requests per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def get_wait_time(self):
+        self.__refill()
+        return 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def reserve(self):
+        # Tokens may go negative, so that each caller reserves the next free slot and callers are served in order
+        self.__refill()
+        self._tokens -= 1
+
+    def refund(self):
+        self.__refill()
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+    def __refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+class RateLimiter:
+    """Token bucket limits per account, per API host and for logins, shared by every connection using the limiter"""
+
+    def __init__(self, account_rate=2, account_burst=10, region_rate=20, region_burst=40, login_rate=0.05, login_burst=3, fail_fast=False):
+        # A rate of None disables that kind of bucket
+        self.limits = {
+            BUCKET_ACCOUNT: (account_rate, account_burst),
+            BUCKET_REGION: (region_rate, region_burst),
+            BUCKET_LOGIN: (login_rate, login_burst)
+        }
+        # Raise MazdaRateLimitedException instead of waiting when a request cannot be sent right away
+        self.fail_fast = fail_fast
+
+        self._buckets = {}
+
+    async def acquire_api_request(self, account_key, base_url):
+        await self.__acquire([(BUCKET_ACCOUNT, account_key), (BUCKET_REGION, base_url)])
+
+    async def acquire_login_request(self, account_key, usher_url):
+        await self.__acquire([(BUCKET_LOGIN, account_key), (BUCKET_REGION, usher_url)])
+
+    async def __acquire(self, bucket_keys):
+        buckets = [bucket for bucket in (self.__get_bucket(kind, key) for kind, key in bucket_keys) if bucket is not None]
+        if not buckets:
+            return
+
+        wait_time = max(bucket.get_wait_time() for bucket in buckets)
+        if wait_time > 0 and self.fail_fast:
+            raise MazdaRateLimitedException("Request rate limit reached")
+
+        for bucket in buckets:
+            bucket.reserve()
+
+        if wait_time > 0:
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Give the reserved slot back so that callers queued behind this one are not delayed for nothing
+                for bucket in buckets:
+                    bucket.refund()
+                raise
+
+    def __get_bucket(self, kind, key):
+        rate, burst = self.limits[kind]
+        if rate is None:
+            return None
+
+        bucket = self._buckets.get((kind, key))
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets[(kind, key)] = bucket
+        return bucket
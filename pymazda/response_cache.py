@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+
+from pymazda.cache_utils import LRUCache
+
+DEFAULT_TTLS = {
+    "getVehicleStatus": 60,
+    "getEVVehicleStatus": 60,
+    "getHVACSetting": 300,
+    "getHealthReport": 3600
+}
+DEFAULT_TTL = 60
+
+class CachedResponse:
+    def __init__(self, value, upstream_timestamp):
+        self.value = value
+        self.upstream_timestamp = upstream_timestamp
+        self.fetched_at = time.monotonic()
+
+class ResponseCache:
+    """Read-through cache for read-only API calls which keeps serving expired entries while a single background refresh runs"""
+
+    def __init__(self, ttls=None, max_size=1024, max_stale=600):
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        # Entries older than their TTL plus max_stale are never served, and are fetched again before returning
+        self.max_stale = max_stale
+
+        self._entries = LRUCache(max_size)
+        self._fetch_tasks = {}
+        self._generations = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, endpoint, vehicle_id, fetch, get_upstream_timestamp=None):
+        key = (endpoint, vehicle_id)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+            if age < ttl:
+                return entry.value
+            if age < ttl + self.max_stale:
+                self.__start_fetch(key, fetch, get_upstream_timestamp)
+                return entry.value
+
+        return await asyncio.shield(self.__start_fetch(key, fetch, get_upstream_timestamp))
+
+    def get_upstream_timestamp(self, endpoint, vehicle_id):
+        entry = self._entries.get((endpoint, vehicle_id))
+        return None if entry is None else entry.upstream_timestamp
+
+    def invalidate(self, vehicle_id, endpoints=None):
+        for endpoint in (endpoints if endpoints is not None else self.ttls.keys()):
+            key = (endpoint, vehicle_id)
+            self._entries.pop(key)
+            # Fetches which started before the invalidation must neither store nor share their now outdated result
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._fetch_tasks.pop(key, None)
+
+    def __start_fetch(self, key, fetch, get_upstream_timestamp):
+        task = self._fetch_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__fetch(key, fetch, get_upstream_timestamp))
+            self._fetch_tasks[key] = task
+            task.add_done_callback(lambda finished_task: self.__on_fetch_done(key, finished_task))
+        return task
+
+    async def __fetch(self, key, fetch, get_upstream_timestamp):
+        generation = self._generations.get(key, 0)
+        value = await fetch()
+
+        if self._generations.get(key, 0) == generation:
+            upstream_timestamp = get_upstream_timestamp(value) if get_upstream_timestamp is not None else None
+            self._entries.set(key, CachedResponse(value, upstream_timestamp))
+        return value
+
+    def __on_fetch_done(self, key, task):
+        if self._fetch_tasks.get(key) is task:
+            del self._fetch_tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Callers awaiting the fetch receive the exception; background refreshes just keep the stale value
+            self.logger.debug("Fetching %s failed: %s", key, task.exception())
+
+    async def close(self):
+        tasks = list(self._fetch_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
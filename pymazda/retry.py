@@ -0,0 +1,111 @@
+import logging
+import random
+import time
+from collections import deque
+
+from pymazda.exceptions import (
+    MazdaAPIEncryptionException,
+    MazdaTokenExpiredException,
+    MazdaLoginFailedException,
+    MazdaRequestInProgressException
+)
+
+MAX_RETRIES = 4
+
+class RetryRule:
+    """Backoff settings for one kind of retryable error"""
+
+    def __init__(self, initial_delay=0, max_delay=0, multiplier=2, jitter=0, max_retries=None):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        # Fraction of each delay which is randomized, so that clients retrying together spread out
+        self.jitter = jitter
+        # Optional limit for this kind of error, applied in addition to the overall per-call limit
+        self.max_retries = max_retries
+
+    def get_delay(self, retry_number):
+        if self.initial_delay <= 0:
+            return 0
+
+        delay = min(self.max_delay, self.initial_delay * (self.multiplier ** (retry_number - 1)))
+        return delay * (1 - self.jitter * random.random())
+
+class RetryBudget:
+    """Limits how many retries may be performed within a rolling time period"""
+
+    def __init__(self, max_retries, period):
+        self.max_retries = max_retries
+        self.period = period
+        self._retry_timestamps = deque()
+
+    def try_acquire(self):
+        now = time.monotonic()
+        while self._retry_timestamps and self._retry_timestamps[0] <= now - self.period:
+            self._retry_timestamps.popleft()
+
+        if len(self._retry_timestamps) >= self.max_retries:
+            return False
+
+        self._retry_timestamps.append(now)
+        return True
+
+class RetryAttempt:
+    """Passed to retry hooks after every attempt to send a request, describing its outcome"""
+
+    def __init__(self, method, uri, attempt_number, exception, delay):
+        self.method = method
+        self.uri = uri
+        # 1 for the first attempt, 2 for the first retry, and so on
+        self.attempt_number = attempt_number
+        # None if the attempt succeeded
+        self.exception = exception
+        # Seconds until the request is retried, or None if it is not retried
+        self.delay = delay
+
+    @property
+    def succeeded(self):
+        return self.exception is None
+
+    @property
+    def will_retry(self):
+        return self.delay is not None
+
+class RetryPolicy:
+    """Decides which failed requests are retried, how long to wait between attempts, and how many retries are allowed"""
+
+    def __init__(self, rules=None, max_retries=MAX_RETRIES, account_max_retries=30, account_retry_period=300, hooks=None):
+        self.rules = {
+            MazdaAPIEncryptionException: RetryRule(),
+            MazdaTokenExpiredException: RetryRule(),
+            MazdaLoginFailedException: RetryRule(initial_delay=1, max_delay=10, jitter=0.5),
+            MazdaRequestInProgressException: RetryRule(initial_delay=5, max_delay=30, jitter=0.25)
+        }
+        if rules is not None:
+            self.rules.update(rules)
+
+        self.max_retries = max_retries
+        self.account_max_retries = account_max_retries
+        self.account_retry_period = account_retry_period
+        self.hooks = list(hooks) if hooks is not None else []
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_rule(self, exception):
+        for exception_class in type(exception).__mro__:
+            if exception_class in self.rules:
+                return self.rules[exception_class]
+        return None
+
+    def create_account_budget(self):
+        return RetryBudget(self.account_max_retries, self.account_retry_period)
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def notify_attempt(self, attempt):
+        for hook in self.hooks:
+            try:
+                hook(attempt)
+            except Exception:
+                self.logger.exception("Retry hook raised an exception")
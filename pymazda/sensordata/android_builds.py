@@ -1,13 +1,13 @@
+import functools
 import json
 
 ANDROID_BUILDS_JSON = '{"Pixel 3":{"codename":"blueline","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.006","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1D.210205.004","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1D.210105.003","version":"11"},{"buildId":"RQ1A.210105.003","version":"11"},{"buildId":"RQ1A.201205.003.A1","version":"11"},{"buildId":"RQ1A.201205.003","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.003","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.008","version":"10"},{"buildId":"QP1A.191105.003","version":"10"},{"buildId":"QP1A.191005.007","version":"10"},{"buildId":"QP1A.190711.020.C3","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.003","version":"9"},{"buildId":"PQ3A.190605.004.A1","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.002","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.001","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.006.A1","version":"9"},{"buildId":"PQ1A.181205.006","version":"9"},{"buildId":"PQ1A.181105.017.A1","version":"9"},{"buildId":"PD1A.180720.031","version":"9"},{"buildId":"PD1A.180720.030","version":"9"}]},"Pixel 3a":{"codename":"sargo","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1A.210105.002","version":"11"},{"buildId":"RQ1A.201205.003","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.002","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.011","version":"10"},{"buildId":"QP1A.191105.003","version":"10"},{"buildId":"QP1A.191005.007","version":"10"},{"buildId":"QP1A.190711.020.C3","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3B.190801.002","version":"9"},{"buildId":"PQ3B.190705.003","version":"9"},{"buildId":"PQ3B.190605.006","version":"9"},{"buildId":"PD2A.190115.032","version":"9"},{"buildId":"PD2A.190115.029","version":"9"}]},"Pixel 3a XL":{"codename":"bonito","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1A.210105.002","version":"11"},{"buildId":"RQ1A.201205.003","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.002","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.011","version":"10"},{"buildId":"QP1A.191105.003","version":"10"},{"buildId":"QP1A.191005.007","version":"10"},{"buildId":"QP1A.190711.020.C3","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3B.190801.002","version":"9"},{"buildId":"PQ3B.190705.003","version":"9"},{"buildId":"PQ3B.190605.006","version":"9"},{"buildId":"PD2A.190115.032","version":"9"},{"buildId":"PD2A.190115.029","version":"9"}]},"Pixel 3 XL":{"codename":"crosshatch","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.006","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1D.210205.004","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1D.210105.003","version":"11"},{"buildId":"RQ1A.210105.003","version":"11"},{"buildId":"RQ1A.201205.003.A1","version":"11"},{"buildId":"RQ1A.201205.003","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.003","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.008","version":"10"},{"buildId":"QP1A.191105.003","version":"10"},{"buildId":"QP1A.191005.007","version":"10"},{"buildId":"QP1A.190711.020.C3","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.003","version":"9"},{"buildId":"PQ3A.190605.004.A1","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.002","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.001","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.006.A1","version":"9"},{"buildId":"PQ1A.181205.006","version":"9"},{"buildId":"PQ1A.181105.017.A1","version":"9"},{"buildId":"PD1A.180720.031","version":"9"},{"buildId":"PD1A.180720.030","version":"9"}]},"Pixel 4":{"codename":"flame","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1A.210105.003","version":"11"},{"buildId":"RQ1A.201205.008.A1","version":"11"},{"buildId":"RQ1A.201205.008","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.004.A1","version":"10"},{"buildId":"QQ2A.200305.003","version":"10"},{"buildId":"QQ1D.200205.002","version":"10"},{"buildId":"QQ1C.200205.002","version":"10"},{"buildId":"QQ1B.200205.002","version":"10"},{"buildId":"QQ1D.200105.002","version":"10"},{"buildId":"QQ1C.200105.004","version":"10"},{"buildId":"QQ1B.200105.004","version":"10"},{"buildId":"QQ1C.191205.016.A1","version":"10"},{"buildId":"QQ1B.191205.012.A1","version":"10"},{"buildId":"QQ1B.191205.011","version":"10"},{"buildId":"QD1A.190821.014.C2","version":"10"},{"buildId":"QD1A.190821.014","version":"10"},{"buildId":"QD1A.190821.007.A3","version":"10"},{"buildId":"QD1A.190821.011.C4","version":"10"},{"buildId":"QD1A.190821.011","version":"10"},{"buildId":"QD1A.190821.007","version":"10"}]},"Pixel 4 XL":{"codename":"coral","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1A.210105.003","version":"11"},{"buildId":"RQ1A.201205.008.A1","version":"11"},{"buildId":"RQ1A.201205.008","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B2","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.004.A1","version":"10"},{"buildId":"QQ2A.200305.003","version":"10"},{"buildId":"QQ1D.200205.002","version":"10"},{"buildId":"QQ1C.200205.002","version":"10"},{"buildId":"QQ1B.200205.002","version":"10"},{"buildId":"QQ1D.200105.002","version":"10"},{"buildId":"QQ1C.200105.004","version":"10"},{"buildId":"QQ1B.200105.004","version":"10"},{"buildId":"QQ1C.191205.016.A1","version":"10"},{"buildId":"QQ1B.191205.012.A1","version":"10"},{"buildId":"QQ1B.191205.011","version":"10"},{"buildId":"QD1A.190821.014.C2","version":"10"},{"buildId":"QD1A.190821.014","version":"10"},{"buildId":"QD1A.190821.007.A3","version":"10"},{"buildId":"QD1A.190821.011.C4","version":"10"},{"buildId":"QD1A.190821.011","version":"10"},{"buildId":"QD1A.190821.007","version":"10"}]},"Pixel 4a":{"codename":"sunfish","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.002","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.007","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1A.210105.002","version":"11"},{"buildId":"RQ1A.201205.008","version":"11"},{"buildId":"RP1A.201105.002","version":"11"},{"buildId":"RP1A.201005.006","version":"11"},{"buildId":"RP1A.200720.011","version":"11"},{"buildId":"RP1A.200720.010","version":"11"},{"buildId":"QD4A.200805.003","version":"10"},{"buildId":"QD4A.200805.001","version":"10"},{"buildId":"QD4A.200317.027","version":"10"},{"buildId":"QD4A.200317.024.A1","version":"10"}]},"Pixel 5":{"codename":"redfin","builds":[{"buildId":"RQ3A.210605.005","version":"11"},{"buildId":"RQ2A.210505.003","version":"11"},{"buildId":"RQ2A.210405.005","version":"11"},{"buildId":"RQ2A.210305.007","version":"11"},{"buildId":"RQ2A.210305.006","version":"11"},{"buildId":"RQ1D.210205.004","version":"11"},{"buildId":"RQ1C.210205.006","version":"11"},{"buildId":"RQ1A.210205.004","version":"11"},{"buildId":"RQ1D.210105.003","version":"11"},{"buildId":"RQ1A.210105.003","version":"11"},{"buildId":"RQ1D.201205.012.A1","version":"11"},{"buildId":"RQ1A.201205.011","version":"11"},{"buildId":"RQ1A.201205.010","version":"11"},{"buildId":"RD1B.201105.010","version":"11"},{"buildId":"RD1A.201105.003.C1","version":"11"},{"buildId":"RD1A.201105.003.B1","version":"11"},{"buildId":"RD1A.201105.003.A1","version":"11"},{"buildId":"RD1A.201105.003","version":"11"},{"buildId":"RD1A.200810.022.A4","version":"11"},{"buildId":"RD1A.200810.021.B3","version":"11"},{"buildId":"RD1A.200810.020.A1","version":"11"},{"buildId":"RD1A.200810.021.A1","version":"11"},{"buildId":"RD1A.200810.020","version":"11"}]},"Pixel 2":{"codename":"walleye","builds":[{"buildId":"RP1A.201005.004.A1","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B3","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.008","version":"10"},{"buildId":"QP1A.191105.004","version":"10"},{"buildId":"QP1A.191005.007.A1","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.001","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.001","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.002","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.002","version":"9"},{"buildId":"PQ1A.181105.017.A1","version":"9"},{"buildId":"PPR2.181005.003","version":"9"},{"buildId":"PPR2.180905.005","version":"9"},{"buildId":"PPR1.180610.011","version":"9"},{"buildId":"PPR1.180610.009","version":"9"},{"buildId":"OPM4.171019.021.Q1","version":"8.1.0"},{"buildId":"OPM2.171026.006.G1","version":"8.1.0"},{"buildId":"OPM4.171019.021.E1","version":"8.1.0"},{"buildId":"OPM2.171026.006.C1","version":"8.1.0"},{"buildId":"OPM4.171019.016.B1","version":"8.1.0"},{"buildId":"OPM2.171019.029.B1","version":"8.1.0"},{"buildId":"OPM4.171019.015.A1","version":"8.1.0"},{"buildId":"OPM2.171019.029","version":"8.1.0"},{"buildId":"OPM1.171019.021","version":"8.1.0"},{"buildId":"OPM1.171019.019","version":"8.1.0"},{"buildId":"OPM2.171019.016","version":"8.1.0"},{"buildId":"OPM1.171019.014","version":"8.1.0"},{"buildId":"OPM1.171019.013","version":"8.1.0"},{"buildId":"OPM2.171019.012","version":"8.1.0"},{"buildId":"OPM1.171019.011","version":"8.1.0"},{"buildId":"OPD3.170816.023","version":"8.1.0"},{"buildId":"OPD1.170816.025","version":"8.1.0"},{"buildId":"OPD3.170816.016","version":"8.1.0"},{"buildId":"OPD2.170816.015","version":"8.1.0"},{"buildId":"OPD1.170816.018","version":"8.1.0"},{"buildId":"OPD3.170816.012","version":"8.1.0"},{"buildId":"OPD1.170816.012","version":"8.1.0"},{"buildId":"OPD1.170816.011","version":"8.1.0"},{"buildId":"OPD1.170816.010","version":"8.1.0"}]},"Pixel 2 XL":{"codename":"taimen","builds":[{"buildId":"RP1A.201005.004.A1","version":"11"},{"buildId":"RP1A.201005.004","version":"11"},{"buildId":"RP1A.200720.009","version":"11"},{"buildId":"QQ3A.200805.001","version":"10"},{"buildId":"QQ3A.200705.002","version":"10"},{"buildId":"QQ3A.200605.002.A1","version":"10"},{"buildId":"QQ3A.200605.001","version":"10"},{"buildId":"QQ2A.200501.001.B3","version":"10"},{"buildId":"QQ2A.200501.001.A3","version":"10"},{"buildId":"QQ2A.200405.005","version":"10"},{"buildId":"QQ2A.200305.002","version":"10"},{"buildId":"QQ1A.200205.002","version":"10"},{"buildId":"QQ1A.200105.002","version":"10"},{"buildId":"QQ1A.191205.008","version":"10"},{"buildId":"QP1A.191105.004","version":"10"},{"buildId":"QP1A.191005.007.A1","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.001","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.001","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.002","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.002","version":"9"},{"buildId":"PQ1A.181105.017.A1","version":"9"},{"buildId":"PPR2.181005.003","version":"9"},{"buildId":"PPR2.180905.005","version":"9"},{"buildId":"PPR1.180610.011","version":"9"},{"buildId":"PPR1.180610.009","version":"9"},{"buildId":"OPM4.171019.021.R1","version":"8.1.0"},{"buildId":"OPM2.171026.006.H1","version":"8.1.0"},{"buildId":"OPM4.171019.021.E1","version":"8.1.0"},{"buildId":"OPM2.171026.006.C1","version":"8.1.0"},{"buildId":"OPM4.171019.016.B1","version":"8.1.0"},{"buildId":"OPM2.171019.029.B1","version":"8.1.0"},{"buildId":"OPM4.171019.015.A1","version":"8.1.0"},{"buildId":"OPM2.171019.029","version":"8.1.0"},{"buildId":"OPM1.171019.021","version":"8.1.0"},{"buildId":"OPM1.171019.018","version":"8.1.0"},{"buildId":"OPM1.171019.014","version":"8.1.0"},{"buildId":"OPM1.171019.013","version":"8.1.0"},{"buildId":"OPM2.171019.012","version":"8.1.0"},{"buildId":"OPM1.171019.011","version":"8.1.0"},{"buildId":"OPD3.170816.023","version":"8.1.0"},{"buildId":"OPD1.170816.025","version":"8.1.0"},{"buildId":"OPD3.170816.012","version":"8.1.0"},{"buildId":"OPD1.170816.012","version":"8.1.0"},{"buildId":"OPD1.170816.011","version":"8.1.0"},{"buildId":"OPD1.170816.010","version":"8.1.0"}]},"Pixel XL":{"codename":"marlin","builds":[{"buildId":"QP1A.191005.007.A3","version":"10"},{"buildId":"QP1A.191005.007.A1","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.001","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.001","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.003","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.002.A1","version":"9"},{"buildId":"PPR2.181005.003.A1","version":"9"},{"buildId":"PPR1.181005.003.A1","version":"9"},{"buildId":"PPR2.181005.003","version":"9"},{"buildId":"PPR1.181005.003","version":"9"},{"buildId":"PPR2.180905.006.A1","version":"9"},{"buildId":"PPR2.180905.006","version":"9"},{"buildId":"PPR1.180905.003","version":"9"},{"buildId":"PPR1.180610.010","version":"9"},{"buildId":"PPR1.180610.009","version":"9"},{"buildId":"OPM4.171019.021.P1","version":"8.1.0"},{"buildId":"OPM4.171019.021.D1","version":"8.1.0"},{"buildId":"OPM4.171019.016.B1","version":"8.1.0"},{"buildId":"OPM2.171019.029","version":"8.1.0"},{"buildId":"OPM1.171019.021","version":"8.1.0"},{"buildId":"OPM1.171019.016","version":"8.1.0"},{"buildId":"OPM1.171019.014","version":"8.1.0"},{"buildId":"OPM1.171019.012","version":"8.1.0"},{"buildId":"OPM1.171019.011","version":"8.1.0"},{"buildId":"OPR3.170623.013","version":"8.1.0"},{"buildId":"OPR1.170623.032","version":"8.1.0"},{"buildId":"OPR3.170623.008","version":"8.1.0"},{"buildId":"OPR1.170623.027","version":"8.1.0"},{"buildId":"OPR3.170623.007","version":"8.1.0"},{"buildId":"OPR1.170623.026","version":"8.1.0"},{"buildId":"OPR6.170623.012","version":"8.1.0"},{"buildId":"OPR6.170623.011","version":"8.1.0"},{"buildId":"NZH54D","version":"7.1"},{"buildId":"NKG47S","version":"7.1"},{"buildId":"NHG47Q","version":"7.1"},{"buildId":"NJH47F","version":"7.1"},{"buildId":"NZH54B","version":"7.1"},{"buildId":"NKG47M","version":"7.1"},{"buildId":"NJH47D","version":"7.1"},{"buildId":"NHG47O","version":"7.1"},{"buildId":"NJH47B","version":"7.1"},{"buildId":"NJH34C","version":"7.1"},{"buildId":"NKG47L","version":"7.1"},{"buildId":"NHG47N","version":"7.1"},{"buildId":"NHG47L","version":"7.1"},{"buildId":"N2G47T","version":"7.1"},{"buildId":"N2G47O","version":"7.1"},{"buildId":"NHG47K","version":"7.1"},{"buildId":"N2G47J","version":"7.1"},{"buildId":"N2G47E","version":"7.1"},{"buildId":"NOF27D","version":"7.1"},{"buildId":"NOF27C","version":"7.1"},{"buildId":"NOF27B","version":"7.1"},{"buildId":"NOF26W","version":"7.1"},{"buildId":"NOF26V","version":"7.1"},{"buildId":"NMF26V","version":"7.1"},{"buildId":"NMF26U","version":"7.1"},{"buildId":"NMF26Q","version":"7.1"},{"buildId":"NMF26O","version":"7.1"},{"buildId":"NDE63X","version":"7.1"},{"buildId":"NDE63V","version":"7.1"},{"buildId":"NDE63U","version":"7.1"},{"buildId":"NDE63P","version":"7.1"},{"buildId":"NDE63L","version":"7.1"},{"buildId":"NDE63H","version":"7.1"}]},"Pixel":{"codename":"sailfish","builds":[{"buildId":"QP1A.191005.007.A3","version":"10"},{"buildId":"QP1A.191005.007.A1","version":"10"},{"buildId":"QP1A.190711.020","version":"10"},{"buildId":"QP1A.190711.019","version":"10"},{"buildId":"PQ3A.190801.002","version":"9"},{"buildId":"PQ3A.190705.001","version":"9"},{"buildId":"PQ3A.190605.003","version":"9"},{"buildId":"PQ3A.190505.001","version":"9"},{"buildId":"PQ2A.190405.003","version":"9"},{"buildId":"PQ2A.190305.002","version":"9"},{"buildId":"PQ2A.190205.003","version":"9"},{"buildId":"PQ1A.190105.004","version":"9"},{"buildId":"PQ1A.181205.002.A1","version":"9"},{"buildId":"PPR2.181005.003.A1","version":"9"},{"buildId":"PPR1.181005.003.A1","version":"9"},{"buildId":"PPR2.181005.003","version":"9"},{"buildId":"PPR1.181005.003","version":"9"},{"buildId":"PPR2.180905.006.A1","version":"9"},{"buildId":"PPR2.180905.006","version":"9"},{"buildId":"PPR1.180905.003","version":"9"},{"buildId":"PPR1.180610.010","version":"9"},{"buildId":"PPR1.180610.009","version":"9"},{"buildId":"OPM4.171019.021.P1","version":"8.1.0"},{"buildId":"OPM4.171019.021.D1","version":"8.1.0"},{"buildId":"OPM4.171019.016.B1","version":"8.1.0"},{"buildId":"OPM2.171019.029","version":"8.1.0"},{"buildId":"OPM1.171019.021","version":"8.1.0"},{"buildId":"OPM1.171019.016","version":"8.1.0"},{"buildId":"OPM1.171019.014","version":"8.1.0"},{"buildId":"OPM1.171019.012","version":"8.1.0"},{"buildId":"OPM1.171019.011","version":"8.1.0"},{"buildId":"OPR3.170623.013","version":"8.1.0"},{"buildId":"OPR1.170623.032","version":"8.1.0"},{"buildId":"OPR3.170623.008","version":"8.1.0"},{"buildId":"OPR1.170623.027","version":"8.1.0"},{"buildId":"OPR3.170623.007","version":"8.1.0"},{"buildId":"OPR1.170623.026","version":"8.1.0"},{"buildId":"OPR6.170623.012","version":"8.1.0"},{"buildId":"OPR6.170623.011","version":"8.1.0"},{"buildId":"NZH54D","version":"7.1"},{"buildId":"NKG47S","version":"7.1"},{"buildId":"NHG47Q","version":"7.1"},{"buildId":"NJH47F","version":"7.1"},{"buildId":"NZH54B","version":"7.1"},{"buildId":"NKG47M","version":"7.1"},{"buildId":"NJH47D","version":"7.1"},{"buildId":"NHG47O","version":"7.1"},{"buildId":"NJH47B","version":"7.1"},{"buildId":"NJH34C","version":"7.1"},{"buildId":"NKG47L","version":"7.1"},{"buildId":"NHG47N","version":"7.1"},{"buildId":"NHG47L","version":"7.1"},{"buildId":"N2G47T","version":"7.1"},{"buildId":"N2G47O","version":"7.1"},{"buildId":"NHG47K","version":"7.1"},{"buildId":"N2G47J","version":"7.1"},{"buildId":"N2G47E","version":"7.1"},{"buildId":"NOF27D","version":"7.1"},{"buildId":"NOF27C","version":"7.1"},{"buildId":"NOF27B","version":"7.1"},{"buildId":"NOF26W","version":"7.1"},{"buildId":"NOF26V","version":"7.1"},{"buildId":"NMF26V","version":"7.1"},{"buildId":"NMF26U","version":"7.1"},{"buildId":"NMF26Q","version":"7.1"},{"buildId":"NMF26O","version":"7.1"},{"buildId":"NDE63X","version":"7.1"},{"buildId":"NDE63V","version":"7.1"},{"buildId":"NDE63U","version":"7.1"},{"buildId":"NDE63P","version":"7.1"},{"buildId":"NDE63L","version":"7.1"},{"buildId":"NDE63H","version":"7.1"}]}}'
 
-class AndroidBuilds:
-    def __init__(self):
-        self.builds = None
+@functools.lru_cache(maxsize=None)
+def parse_android_builds():
+    # The table is large and never modified, so it is parsed once and shared by every instance
+    return json.loads(ANDROID_BUILDS_JSON)
 
+class AndroidBuilds:
     def get_builds(self):
-        if self.builds is None:
-            self.builds = json.loads(ANDROID_BUILDS_JSON)
-
-        return self.builds
\ No newline at end of file
+        return parse_android_builds()
\ No newline at end of file
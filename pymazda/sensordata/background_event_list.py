@@ -4,6 +4,8 @@ import random
 from pymazda.sensordata.sensor_data_util import timestamp_to_millis
 
 class BackgroundEvent:
+    __slots__ = ("type", "timestamp")
+
     def __init__(self, type, timestamp):
         self.type = type
         self.timestamp = timestamp
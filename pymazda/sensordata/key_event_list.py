@@ -2,6 +2,8 @@ import datetime
 import random
 
 class KeyEvent:
+    __slots__ = ("time", "id_char_code_sum", "longer_than_before")
+
     def __init__(self, time, id_char_code_sum, longer_than_before):
         self.time = time
         self.id_char_code_sum = id_char_code_sum
@@ -13,9 +15,14 @@ class KeyEvent:
 class KeyEventList:
     def __init__(self):
         self.key_events = []
+        self._event_strings = []
+        self._sum = 0
 
     def randomize(self, sensor_collection_start_timestamp):
         self.key_events = []
+        # The serialized events and their sum are built while the events are generated, instead of walking them again later
+        self._event_strings = []
+        self._sum = 0
 
         if random.randrange(0, 20) > 0:
             return
@@ -30,15 +37,16 @@ class KeyEventList:
         id_char_code_sum = random.randrange(517, 519)
         for i in range(event_count):
             time = random.randrange(5000, 8000) if i == 0 else random.randrange(10, 50)
-            self.key_events.append(KeyEvent(time, id_char_code_sum, random.randrange(0, 2) == 0))
+            key_event = KeyEvent(time, id_char_code_sum, random.randrange(0, 2) == 0)
+            self.key_events.append(key_event)
+            self._event_strings.append(key_event.to_string())
+            self._sum += id_char_code_sum + time + 2
+
+    def __len__(self):
+        return len(self.key_events)
 
     def to_string(self):
-        return "".join(map(lambda event: event.to_string(), self.key_events))
+        return "".join(self._event_strings)
 
     def get_sum(self):
-        sum = 0
-        for key_event in self.key_events:
-            sum += key_event.id_char_code_sum
-            sum += key_event.time
-            sum += 2
-        return sum
\ No newline at end of file
+        return self._sum
\ No newline at end of file
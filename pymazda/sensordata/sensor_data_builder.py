@@ -5,7 +5,7 @@ import random
 from pymazda.sensordata.background_event_list import BackgroundEventList
 from pymazda.sensordata.key_event_list import KeyEventList
 from pymazda.sensordata.performance_test_results import PerformanceTestResults
-from pymazda.sensordata.sensor_data_util import feistel_cipher, timestamp_to_millis
+from pymazda.sensordata.sensor_data_util import feistel_cipher, sum_char_codes, timestamp_to_millis
 from pymazda.sensordata.system_info import SystemInfo
 from pymazda.sensordata.touch_event_list import TouchEventList
 
@@ -28,6 +28,65 @@ class SensorDataBuilder:
 
         self.sensor_data_encryptor = SensorDataEncryptor()
 
+        self.__build_static_segments()
+
+    def __build_static_segments(self):
+        # Everything except the events, the random number and the misc stat is fixed once the builder is created
+        self._sensor_collection_start_millis = timestamp_to_millis(self.sensor_collection_start_timestamp)
+
+        system_info_str = self.system_info.to_string()
+        self._system_info_segment = "".join([
+            SDK_VERSION,
+            "-1,2,-94,-100,",
+            system_info_str,
+            ",",
+            str(sum_char_codes(system_info_str)),
+            ","
+        ])
+
+        self._pre_key_events_segment = "".join([
+            ",",
+            str(int(self._sensor_collection_start_millis / 2)),
+            "-1,2,-94,-101,",
+            "do_en,dm_en,t_en",
+            "-1,2,-94,-102,",
+            self.generate_edited_text(),
+            "-1,2,-94,-108,"
+        ])
+
+        orientation_event = self.generate_orientation_data_aa()
+        self._orientation_event_count = orientation_event.count(";")
+        motion_event = self.generate_motion_data_aa()
+        self._motion_event_count = motion_event.count(";")
+
+        self._post_touch_events_segment = "".join([
+            "-1,2,-94,-111,",
+            orientation_event,
+            "-1,2,-94,-109,",
+            motion_event,
+            "-1,2,-94,-144,",
+            self.generate_orientation_data_ac(),
+            "-1,2,-94,-142,",
+            self.generate_orientation_data_ab(),
+            "-1,2,-94,-145,",
+            self.generate_motion_data_ac(),
+            "-1,2,-94,-143,",
+            self.generate_motion_event(),
+            "-1,2,-94,-115,"
+        ])
+
+        self._post_misc_stat_segment = "".join([
+            "-1,2,-94,-106,",
+            self.generate_stored_values_f(),
+            ",",
+            self.generate_stored_values_g(),
+            "-1,2,-94,-120,",
+            self.generate_stored_stack_traces(),
+            "-1,2,-94,-112,",
+            self.performance_test_results.to_string(),
+            "-1,2,-94,-103,"
+        ])
+
     def generate_sensor_data(self):
         self.touch_event_list.randomize(self.sensor_collection_start_timestamp)
         self.key_event_list.randomize(self.sensor_collection_start_timestamp)
@@ -35,57 +94,18 @@ class SensorDataBuilder:
 
         random_number = random.randrange(-(2 ** 31), 2 ** 31)
 
-        orientation_event = self.generate_orientation_data_aa()
-        orientation_event_count = orientation_event.count(";")
-        motion_event = self.generate_motion_data_aa()
-        motion_event_count = motion_event.count(";")
-
-        sensor_data = ""
-        sensor_data += SDK_VERSION
-        sensor_data += "-1,2,-94,-100,"
-        sensor_data += self.system_info.to_string()
-        sensor_data += ","
-        sensor_data += str(self.system_info.get_char_code_sum())
-        sensor_data += ","
-        sensor_data += str(random_number)
-        sensor_data += ","
-        sensor_data += str(int(timestamp_to_millis(self.sensor_collection_start_timestamp) / 2))
-        sensor_data += "-1,2,-94,-101,"
-        sensor_data += "do_en"
-        sensor_data += ","
-        sensor_data += "dm_en"
-        sensor_data += ","
-        sensor_data += "t_en"
-        sensor_data += "-1,2,-94,-102,"
-        sensor_data += self.generate_edited_text()
-        sensor_data += "-1,2,-94,-108,"
-        sensor_data += self.key_event_list.to_string()
-        sensor_data += "-1,2,-94,-117,"
-        sensor_data += self.touch_event_list.to_string()
-        sensor_data += "-1,2,-94,-111,"
-        sensor_data += orientation_event
-        sensor_data += "-1,2,-94,-109,"
-        sensor_data += motion_event
-        sensor_data += "-1,2,-94,-144,"
-        sensor_data += self.generate_orientation_data_ac()
-        sensor_data += "-1,2,-94,-142,"
-        sensor_data += self.generate_orientation_data_ab()
-        sensor_data += "-1,2,-94,-145,"
-        sensor_data += self.generate_motion_data_ac()
-        sensor_data += "-1,2,-94,-143,"
-        sensor_data += self.generate_motion_event()
-        sensor_data += "-1,2,-94,-115,"
-        sensor_data += self.generate_misc_stat(orientation_event_count, motion_event_count)
-        sensor_data += "-1,2,-94,-106,"
-        sensor_data += self.generate_stored_values_f()
-        sensor_data += ","
-        sensor_data += self.generate_stored_values_g()
-        sensor_data += "-1,2,-94,-120,"
-        sensor_data += self.generate_stored_stack_traces()
-        sensor_data += "-1,2,-94,-112,"
-        sensor_data += self.performance_test_results.to_string()
-        sensor_data += "-1,2,-94,-103,"
-        sensor_data += self.background_event_list.to_string()
+        sensor_data = "".join([
+            self._system_info_segment,
+            str(random_number),
+            self._pre_key_events_segment,
+            self.key_event_list.to_string(),
+            "-1,2,-94,-117,",
+            self.touch_event_list.to_string(),
+            self._post_touch_events_segment,
+            self.generate_misc_stat(self._orientation_event_count, self._motion_event_count),
+            self._post_misc_stat_segment,
+            self.background_event_list.to_string()
+        ])
 
         encrypted_sensor_data = self.sensor_data_encryptor.encrypt_sensor_data(sensor_data)
         return encrypted_sensor_data
@@ -128,15 +148,15 @@ class SensorDataBuilder:
             str(motion_data_b),
             str(overall_sum),
             str(time_since_sensor_collection_start),
-            str(len(self.key_event_list.key_events)),
-            str(len(self.touch_event_list.touch_events)),
+            str(len(self.key_event_list)),
+            str(len(self.touch_event_list)),
             str(orientation_data_count),
             str(motion_data_count),
             str(self.device_info_time),
             str(random.randrange(5, 15) * 1000),
             "0",
-            str(feistel_cipher(overall_sum, len(self.key_event_list.key_events) + len(self.touch_event_list.touch_events) + orientation_data_count + motion_data_count, time_since_sensor_collection_start)),
-            str(timestamp_to_millis(self.sensor_collection_start_timestamp)),
+            str(feistel_cipher(overall_sum, len(self.key_event_list) + len(self.touch_event_list) + orientation_data_count + motion_data_count, time_since_sensor_collection_start)),
+            str(self._sensor_collection_start_millis),
             "0"
         ])
 
@@ -1,22 +1,21 @@
+# Encoded form of each UTF-8 byte, indexed by byte value
+PERCENT_ENCODE_TABLE = tuple(
+    chr(byte) if byte >= 33 and byte <= 0x7E and byte != 34 and byte != 37 and byte != 39 and byte != 44 and byte != 92 else "%" + format(byte, "x").upper()
+    for byte in range(256)
+)
+
+# Maps bytes outside the ASCII range to 0 so that they do not count towards the sum
+ASCII_BYTES_TABLE = bytes(byte if byte < 0x80 else 0 for byte in range(256))
+
 def percent_encode(str):
     if str is None:
         return ""
 
-    result_str = ""
-    for char in str.encode():
-        if char >= 33 and char <= 0x7E and char != 34 and char != 37 and char != 39 and char != 44 and char != 92:
-            result_str += chr(char)
-        else:
-            result_str += "%"
-            result_str += format(char, "x").upper()
-    return result_str
+    # Decoding as Latin-1 turns each UTF-8 byte into the character with the same code, which str.translate then looks up
+    return str.encode().decode("latin-1").translate(PERCENT_ENCODE_TABLE)
 
 def sum_char_codes(str):
-    sum = 0
-    for char in str.encode():
-        if char < 0x80:
-            sum += char
-    return sum
+    return sum(str.encode().translate(ASCII_BYTES_TABLE))
 
 def feistel_cipher(upper_32_bits, lower_32_bits, key):
     def to_signed_32(n):
@@ -17,6 +17,14 @@ ANDROID_VERSION_TO_SDK_VERSION = {
 }
 
 class SystemInfo:
+    __slots__ = (
+        "android_builds", "screen_height", "screen_width", "battery_charging", "battery_level", "orientation", "language",
+        "android_version", "rotation_lock", "build_model", "build_bootloader", "build_hardware", "package_name", "android_id",
+        "keyboard", "adb_enabled", "build_version_codename", "build_version_incremental", "build_version_sdk",
+        "build_manufacturer", "build_product", "build_tags", "build_type", "build_user", "build_display", "build_board",
+        "build_brand", "build_device", "build_fingerprint", "build_host", "build_id"
+    )
+
     def __init__(self):
         self.android_builds = AndroidBuilds()
 
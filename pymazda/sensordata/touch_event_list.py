@@ -1,7 +1,10 @@
 import datetime
 import random
+from array import array
 
 class TouchEvent:
+    __slots__ = ("type", "time", "pointer_count", "tool_type")
+
     def __init__(self, type, time, pointer_count, tool_type):
         self.type = type
         self.time = time
@@ -13,10 +16,22 @@ class TouchEvent:
 
 class TouchEventList:
     def __init__(self):
-        self.touch_events = []
+        # Events are kept as parallel columns, since a new list of them is generated for every request
+        self._types = array("i")
+        self._times = array("i")
+        self._event_strings = []
+        self._sum = 0
+
+    @property
+    def touch_events(self):
+        return [TouchEvent(type, time, 1, 1) for type, time in zip(self._types, self._times)]
 
     def randomize(self, sensor_collection_start_timestamp):
-        self.touch_events = []
+        self._types = array("i")
+        self._times = array("i")
+        # The serialized events and their sum are built while the events are generated, instead of walking them again later
+        self._event_strings = []
+        self._sum = 0
 
         now_timestamp = datetime.datetime.now(datetime.timezone.utc)
         time_since_sensor_collection_start = int((now_timestamp - sensor_collection_start_timestamp) / datetime.timedelta(milliseconds=1))
@@ -24,28 +39,10 @@ class TouchEventList:
         if time_since_sensor_collection_start < 3000:
             return
         elif time_since_sensor_collection_start >= 3000 and time_since_sensor_collection_start < 5000:
-            # down event
-            self.touch_events.append(TouchEvent(2, time_since_sensor_collection_start - random.randrange(1000, 2000), 1, 1))
-
-            # move events
-            num_move_events = random.randrange(2, 9)
-            for i in range(num_move_events):
-                self.touch_events.append(TouchEvent(1, random.randrange(3, 50), 1, 1))
-
-            # up event
-            self.touch_events.append(TouchEvent(3, random.randrange(3, 100), 1, 1))
+            self.__add_gesture(time_since_sensor_collection_start - random.randrange(1000, 2000))
         elif time_since_sensor_collection_start >= 5000 and time_since_sensor_collection_start < 10000:
             for i in range(2):
-                # down event
-                self.touch_events.append(TouchEvent(2, random.randrange(100, 1000) + (5000 if i == 1 else 0), 1, 1))
-
-                # move events
-                num_move_events = random.randrange(2, 9)
-                for i in range(num_move_events):
-                    self.touch_events.append(TouchEvent(1, random.randrange(3, 50), 1, 1))
-
-                # up event
-                self.touch_events.append(TouchEvent(3, random.randrange(3, 100), 1, 1))
+                self.__add_gesture(random.randrange(100, 1000) + (5000 if i == 1 else 0))
         else:
             for i in range(3):
                 timestamp_offset = 0
@@ -54,23 +51,30 @@ class TouchEventList:
                 else:
                     timestamp_offset = random.randrange(2000, 3000)
 
-                # down event
-                self.touch_events.append(TouchEvent(2, random.randrange(100, 1000) + timestamp_offset, 1, 1))
+                self.__add_gesture(random.randrange(100, 1000) + timestamp_offset)
+
+    def __add_gesture(self, down_time):
+        # down event
+        self.__add_events(2, [down_time])
+
+        # move events
+        num_move_events = random.randrange(2, 9)
+        self.__add_events(1, [random.randrange(3, 50) for i in range(num_move_events)])
+
+        # up event
+        self.__add_events(3, [random.randrange(3, 100)])
 
-                # move events
-                num_move_events = random.randrange(2, 9)
-                for i in range(num_move_events):
-                    self.touch_events.append(TouchEvent(1, random.randrange(3, 50), 1, 1))
+    def __add_events(self, type, times):
+        self._types.extend([type] * len(times))
+        self._times.extend(times)
+        self._event_strings.extend([f"{type},{time},0,0,1,1,1,-1;" for time in times])
+        self._sum += type * len(times) + sum(times)
 
-                # up event
-                self.touch_events.append(TouchEvent(3, random.randrange(3, 100), 1, 1))
+    def __len__(self):
+        return len(self._times)
 
     def to_string(self):
-        return "".join(map(lambda event: event.to_string(), self.touch_events))
+        return "".join(self._event_strings)
 
     def get_sum(self):
-        sum = 0
-        for touch_event in self.touch_events:
-            sum += touch_event.type
-            sum += touch_event.time
-        return sum
\ No newline at end of file
+        return self._sum
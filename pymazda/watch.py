@@ -0,0 +1,45 @@
+import asyncio
+import time
+from collections import deque
+
+# Fields which change every time the vehicle reports in, even if nothing else about it changed
+IGNORED_STATUS_FIELDS = {"lastUpdatedTimestamp", "positionTimestamp"}
+
+# Changes to these fields mean the vehicle is being driven
+ACTIVITY_STATUS_FIELDS = {"latitude", "longitude", "odometerKm"}
+
+class CallBudget:
+    """Limits how many requests may be sent within a rolling time period, waiting for capacity instead of failing"""
+
+    def __init__(self, max_calls, period):
+        self.max_calls = max_calls
+        self.period = period
+        self._call_timestamps = deque()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self._call_timestamps and self._call_timestamps[0] <= now - self.period:
+                self._call_timestamps.popleft()
+
+            if len(self._call_timestamps) < self.max_calls:
+                self._call_timestamps.append(now)
+                return
+
+            await asyncio.sleep(self._call_timestamps[0] + self.period - now)
+
+def diff_vehicle_status(old_status, new_status, prefix=""):
+    changes = {}
+    for key, new_value in new_status.items():
+        if not prefix and key in IGNORED_STATUS_FIELDS:
+            continue
+
+        old_value = old_status.get(key) if old_status is not None else None
+        if isinstance(new_value, dict):
+            changes.update(diff_vehicle_status(old_value if isinstance(old_value, dict) else None, new_value, prefix + key + "."))
+        elif old_status is None or old_value != new_value:
+            changes[prefix + key] = {"old": old_value, "new": new_value}
+    return changes
+
+def is_vehicle_active(changes):
+    return any(field in changes for field in ACTIVITY_STATUS_FIELDS)